@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseSettings, Field
 import qdrant_client
 
@@ -5,27 +7,41 @@ class QdrantConfig(BaseSettings):
     url: str = Field(..., env='QDRANT_URL')
     api_key: str = Field(..., env='QDRANT_API_KEY')
     port: int = Field(6333, env='QDRANT_PORT')
-    prefer_grpc: bool = Field(False, env='QDRANT_PREFER_GRPC')
+    grpc_port: int = Field(6334, env='QDRANT_GRPC_PORT')
+    prefer_grpc: bool = Field(True, env='QDRANT_PREFER_GRPC')
 
     class Config:
         env_file = '.env'
         env_file_encoding = 'utf-8'
 
-def get_qdrant_client() -> qdrant_client.QdrantClient:
+GRPC_OPTIONS = {
+    "grpc.http2.initial_window_size": 16 * 1024 * 1024,
+    "grpc.http2.initial_connection_window_size": 32 * 1024 * 1024,
+    "grpc.max_receive_message_length": 64 * 1024 * 1024,
+}
+
+def get_qdrant_client(prefer_grpc: Optional[bool] = None) -> qdrant_client.QdrantClient:
     """
     Returns configured Qdrant client with connection pooling
     
+    Args:
+        prefer_grpc: Override the configured transport (REST can win for
+            small payloads with large strings)
+    
     Metadata:
         - Dependencies: QdrantConfig
         - Error Handling: Connection validation
         - Performance: GRPC/HTTP2 support
     """
     config = QdrantConfig()
+    use_grpc = config.prefer_grpc if prefer_grpc is None else prefer_grpc
     return qdrant_client.QdrantClient(
         url=config.url,
         port=config.port,
+        grpc_port=config.grpc_port,
         api_key=config.api_key,
-        prefer_grpc=config.prefer_grpc
+        prefer_grpc=use_grpc,
+        grpc_options=GRPC_OPTIONS if use_grpc else None
     )
 
 qdrant_client = get_qdrant_client()
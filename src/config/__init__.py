@@ -1,4 +1,8 @@
-"""Configuration module for the application."""
+"""Configuration module for the application.
+
+Config models are frozen: they are validated once and then shared, so
+instances (including defaults) can be reused safely across coordinators.
+"""
 
 from typing import Dict, Any
 from pydantic import BaseModel, ConfigDict
@@ -7,6 +11,7 @@ from pydantic import BaseModel, ConfigDict
 class ResourceConfig(BaseModel):
     """Resource configuration for the system."""
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "gemini_max_tokens": 2_000_000,
@@ -28,6 +33,7 @@ class ResourceConfig(BaseModel):
 class GeminiConfig(BaseModel):
     """Configuration for Gemini model."""
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "api_key": "your-api-key",
@@ -45,6 +51,7 @@ class GeminiConfig(BaseModel):
 class GPT4MiniConfig(BaseModel):
     """Configuration for GPT-4-mini model."""
     model_config = ConfigDict(
+        frozen=True,
         json_schema_extra={
             "example": {
                 "api_key": "your-api-key",
@@ -2,27 +2,29 @@
 Core coordinator for managing the analysis pipeline.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Mapping, Union
 import asyncio
 import logging
+import time
+from collections import defaultdict
+from dataclasses import replace
 from datetime import datetime, UTC
-from zoneinfo import ZoneInfo
+from types import MappingProxyType
 
 from src.config import ResourceConfig, GeminiConfig, GPT4MiniConfig
 from src.llm.gpt4_mini import GPT4MiniClient
 from src.retrieval.gemini import GeminiRetriever
 from src.metadata.metadata_manager import MetadataGenerationAgent
 from src.reasoning.agents.system import ReasoningSystem
+from src.core.cache import LRUKCache
 from src.core.metrics import AgentMetrics, SystemMetrics
-from src.reasoning.types import (
-    CodeContext,
-    ComprehensiveAnalysis,
-    AgentAnalysis,
-    CodeUnderstandingLevel
-)
+from src.reasoning.types import CodeContext, ComprehensiveAnalysis
 
 logger = logging.getLogger(__name__)
 
+# Configs are frozen, so one validated default can be shared by every coordinator
+_DEFAULT_RESOURCE_CONFIG = ResourceConfig()
+
 
 class SystemCoordinator:
     """Coordinator for the analysis system."""
@@ -40,24 +42,80 @@ class SystemCoordinator:
             gemini_key: API key for Gemini 1.5 Pro
             config: Optional resource configuration
         """
-        self.config = config or ResourceConfig()
+        self.config = config or _DEFAULT_RESOURCE_CONFIG
+        self._setup(
+            gemini=self._build_gemini(gemini_key),
+            gpt4_mini=self._build_gpt4_mini(gpt4_mini_key),
+            metadata_agent=MetadataGenerationAgent()
+        )
+    
+    @classmethod
+    async def create(
+        cls,
+        gpt4_mini_key: str,
+        gemini_key: str,
+        config: Optional[ResourceConfig] = None
+    ) -> "SystemCoordinator":
+        """Create a system coordinator, building its clients concurrently.
         
-        # Initialize core components
-        self.gemini = GeminiRetriever(
+        The Gemini retriever, GPT-4-mini client and metadata agent are
+        independent, so their construction (client configuration, Qdrant
+        connection setup) runs in parallel worker threads instead of one
+        after another on the event loop.
+        
+        Args:
+            gpt4_mini_key: API key for GPT-4-mini
+            gemini_key: API key for Gemini 1.5 Pro
+            config: Optional resource configuration
+            
+        Returns:
+            Ready-to-use system coordinator
+        """
+        coordinator = cls.__new__(cls)
+        coordinator.config = config or _DEFAULT_RESOURCE_CONFIG
+        gemini, gpt4_mini, metadata_agent = await asyncio.gather(
+            asyncio.to_thread(coordinator._build_gemini, gemini_key),
+            asyncio.to_thread(coordinator._build_gpt4_mini, gpt4_mini_key),
+            asyncio.to_thread(MetadataGenerationAgent)
+        )
+        coordinator._setup(gemini, gpt4_mini, metadata_agent)
+        return coordinator
+    
+    def _build_gemini(self, gemini_key: str) -> GeminiRetriever:
+        """Build the Gemini retriever."""
+        return GeminiRetriever(
             GeminiConfig(
                 api_key=gemini_key,
                 max_tokens=self.config.gemini_max_tokens
             )
         )
-        self.gpt4_mini = GPT4MiniClient(
+    
+    def _build_gpt4_mini(self, gpt4_mini_key: str) -> GPT4MiniClient:
+        """Build the GPT-4-mini client."""
+        return GPT4MiniClient(
             GPT4MiniConfig(
                 api_key=gpt4_mini_key,
                 max_tokens=self.config.gpt4_mini_max_tokens
             )
         )
+    
+    def _setup(
+        self,
+        gemini: GeminiRetriever,
+        gpt4_mini: GPT4MiniClient,
+        metadata_agent: MetadataGenerationAgent
+    ) -> None:
+        """Wire the reasoning system, metrics and cache around the clients.
+        
+        Args:
+            gemini: Gemini retriever
+            gpt4_mini: GPT-4-mini client
+            metadata_agent: Metadata generation agent
+        """
+        self.gemini = gemini
+        self.gpt4_mini = gpt4_mini
         
         # Initialize reasoning system
-        metadata_agent = MetadataGenerationAgent()
         self.reasoning = ReasoningSystem(
             metadata_extractor=metadata_agent,
             gemini_retriever=self.gemini,
@@ -67,7 +125,12 @@ class SystemCoordinator:
         # Initialize metrics and cache
         self.agent_metrics: Dict[str, AgentMetrics] = {}
         self.system_metrics = SystemMetrics()
-        self.cache: Dict[str, ComprehensiveAnalysis] = {}
+        self.cache: LRUKCache = LRUKCache.from_budget(self.config.cache_size_mb)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # The reasoning system keeps no per-call state, so it is shared by all
+        # analyses; this bounds how many run through it at once
+        self._reasoning_slots = asyncio.Semaphore(self.config.max_parallel_agents)
     
     async def analyze_code(
         self,
@@ -86,89 +149,119 @@ class SystemCoordinator:
             Comprehensive analysis from all agents
         """
         # Check cache first
-        if (
-            self.config.enable_retrieval_cache
-            and cache_key
-            and cache_key in self.cache
-        ):
-            self.system_metrics.cache_hits += 1
-            return self.cache[cache_key]
+        use_cache = self.config.enable_retrieval_cache and cache_key
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.system_metrics.cache_hits += 1
+                return cached
+        
+        # Join an identical analysis that is already running
+        if cache_key:
+            pending = self._inflight.get(cache_key)
+            if pending is not None:
+                self.system_metrics.inflight_joins += 1
+                try:
+                    return await asyncio.shield(pending)
+                except asyncio.CancelledError:
+                    # Only our own cancellation propagates
+                    if not pending.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                # The leader was cancelled; start over to take its place, or
+                # to join or reuse the result of whoever did
+                return await self.analyze_code(context, query, cache_key)
+            pending = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = pending
         
         self.system_metrics.cache_misses += 1
         
-        # Start analysis
-        start_time = datetime.now()
         try:
-            analysis = await self.reasoning.analyze(
-                context=context,
-                query=query
-            )
+            async with self._reasoning_slots:
+                # Timed once a slot is held, so queueing isn't counted
+                start_time = time.perf_counter()
+                analysis = await self.reasoning.analyze(
+                    context=context,
+                    query=query
+                )
+                duration = time.perf_counter() - start_time
             
             # Update metrics
-            duration = (datetime.now() - start_time).total_seconds()
             self.system_metrics.total_analyses += 1
             self.system_metrics.total_duration += duration
-            self.system_metrics.average_duration = (
-                self.system_metrics.total_duration / self.system_metrics.total_analyses
-            )
             
-            # Update token usage
+            # Update per-agent metrics with each agent's own token usage
             token_usage = self._get_token_usage(analysis)
+            now = datetime.now(UTC)
             for agent_analysis in analysis.agent_analyses:
                 self._update_metrics(
                     agent_id=agent_analysis.agent_name,
                     success=agent_analysis.success,
                     latency=duration,
-                    token_usage=token_usage
+                    token_usage=token_usage.get(agent_analysis.agent_name, {}),
+                    now=now
                 )
             
             # Cache results if enabled
-            if cache_key and self.config.enable_retrieval_cache:
+            if use_cache:
                 self.cache[cache_key] = analysis
+                self.system_metrics.cache_evictions = self.cache.evictions
             
+            if cache_key:
+                pending.set_result(analysis)
             return analysis
             
         except Exception as e:
             logger.error(f"Error during analysis: {str(e)}")
+            if cache_key:
+                pending.set_exception(e)
+                # Waiters re-raise it themselves; don't log it as unretrieved
+                pending.exception()
             raise
+        finally:
+            if cache_key:
+                self._inflight.pop(cache_key, None)
+                # Cancelled leaders skip the handlers above; wake waiters so
+                # one of them takes over
+                if not pending.done():
+                    pending.cancel()
     
     async def batch_analyze(
         self,
         contexts: List[CodeContext],
         query: Optional[str] = None
-    ) -> List[ComprehensiveAnalysis]:
+    ) -> List[Union[ComprehensiveAnalysis, Exception]]:
         """Analyze multiple code contexts in parallel.
         
+        Concurrency is bounded by the coordinator's reasoning slots
+        (``config.max_parallel_agents``), so a large batch doesn't trip
+        provider rate limits. A failing context yields its exception in place
+        of a result instead of cancelling the rest.
+        
         Args:
             contexts: List of code contexts to analyze
             query: Optional query to focus the analysis
             
         Returns:
-            List of comprehensive analyses
+            List of comprehensive analyses or exceptions, in input order
         """
-        tasks = []
-        for context in contexts:
-            task = asyncio.create_task(
-                self.analyze_code(
-                    context=context,
-                    query=query
+        results = await asyncio.gather(
+            *(self.analyze_code(context=context, query=query) for context in contexts),
+            return_exceptions=True
+        )
+        for context, result in zip(contexts, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error during batch analysis of {context.file_path}: {str(result)}"
                 )
-            )
-            tasks.append(task)
-        
-        try:
-            results = await asyncio.gather(*tasks)
-            return results
-        except Exception as e:
-            logger.error(f"Error during batch analysis: {str(e)}")
-            raise
+        return results
     
     def _update_metrics(
         self,
         agent_id: str,
         success: bool,
         latency: float,
-        token_usage: Dict[str, int]
+        token_usage: Dict[str, int],
+        now: datetime
     ) -> None:
         """Update agent metrics.
         
@@ -177,54 +270,64 @@ class SystemCoordinator:
             success: Whether the operation succeeded
             latency: Operation latency in seconds
             token_usage: Token usage by model
+            now: Completion time of the analysis, shared by all its agents
         """
-        if agent_id not in self.agent_metrics:
-            self.agent_metrics[agent_id] = AgentMetrics()
+        metrics = self.agent_metrics.get(agent_id)
+        if metrics is None:
+            metrics = self.agent_metrics[agent_id] = AgentMetrics()
         
-        metrics = self.agent_metrics[agent_id]
+        # Update running totals; averages are derived on read
         metrics.total_operations += 1
-        
-        # Update running averages
-        metrics.success_rate = (
-            (metrics.success_rate * (metrics.total_operations - 1) + int(success))
-            / metrics.total_operations
-        )
-        metrics.average_latency = (
-            (metrics.average_latency * (metrics.total_operations - 1) + latency)
-            / metrics.total_operations
-        )
+        metrics.total_successes += success
+        metrics.total_latency += latency
         
         # Update token usage
         for model, tokens in token_usage.items():
-            current = metrics.token_usage.get(model, 0)
-            metrics.token_usage[model] = current + tokens
+            metrics.token_usage[model] += tokens
         
-        metrics.last_updated = datetime.now()
+        metrics.last_updated = now
     
-    def _get_token_usage(self, analysis: ComprehensiveAnalysis) -> Dict[str, int]:
-        """Extract token usage from analysis results.
+    def _get_token_usage(
+        self,
+        analysis: ComprehensiveAnalysis
+    ) -> Dict[str, Dict[str, int]]:
+        """Extract per-agent token usage from analysis results.
         
         Args:
             analysis: The comprehensive analysis
             
         Returns:
-            Dictionary of model names to token counts
+            Dictionary of agent names to their model token counts
         """
-        usage: Dict[str, int] = {}
+        usage: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         for agent_analysis in analysis.agent_analyses:
             if isinstance(agent_analysis.findings, dict) and "token_usage" in agent_analysis.findings:
-                token_usage = agent_analysis.findings["token_usage"]
-                for model, tokens in token_usage.items():
-                    usage[model] = usage.get(model, 0) + tokens
+                agent_usage = usage[agent_analysis.agent_name]
+                for model, tokens in agent_analysis.findings["token_usage"].items():
+                    agent_usage[model] += tokens
         return usage
     
-    def get_metrics(self) -> Dict[str, AgentMetrics]:
+    def get_metrics(self) -> Mapping[str, AgentMetrics]:
         """Get current agent metrics.
         
+        The result is a live read-only view, so polling doesn't copy anything;
+        use ``snapshot()`` for values that must not change under the caller.
+        
+        Returns:
+            Read-only mapping of agent IDs to their metrics
+        """
+        return MappingProxyType(self.agent_metrics)
+    
+    def snapshot(self) -> Dict[str, AgentMetrics]:
+        """Get a point-in-time copy of agent metrics.
+        
         Returns:
-            Dictionary of agent IDs to their metrics
+            Dictionary of agent IDs to copies of their metrics
         """
-        return self.agent_metrics.copy()
+        return {
+            agent_id: replace(metrics, token_usage=dict(metrics.token_usage))
+            for agent_id, metrics in self.agent_metrics.items()
+        }
     
     def clear_cache(self) -> None:
         """Clear the analysis cache."""
@@ -1,58 +1,70 @@
-"""Metrics tracking for the system."""
+"""Metrics tracking for the system.
 
-from datetime import datetime
+These are plain slotted dataclasses rather than Pydantic models: they are
+internal counters mutated on every analysis, so attribute writes should be
+simple slot stores without validation.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, UTC
 from typing import Dict, Any
-from pydantic import BaseModel, Field, ConfigDict
-
-
-class AgentMetrics(BaseModel):
-    """Metrics for agent performance and resource usage."""
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "success_rate": 0.95,
-                "average_latency": 0.234,
-                "token_usage": {
-                    "gemini": 1000,
-                    "gpt4_mini": 500
-                },
-                "last_updated": "2024-02-16T16:10:04-03:00"
-            }
-        }
-    )
-
-    success_rate: float = Field(default=0.0, description="Success rate of operations")
-    average_latency: float = Field(default=0.0, description="Average operation latency in seconds")
-    token_usage: Dict[str, int] = Field(
-        default_factory=dict,
-        description="Token usage by model"
-    )
-    last_updated: datetime = Field(
-        default_factory=datetime.now,
-        description="Last time metrics were updated"
-    )
-    total_operations: int = Field(
-        default=0,
-        description="Total number of operations performed"
-    )
-
-
-class SystemMetrics(BaseModel):
+
+
+@dataclass(slots=True)
+class AgentMetrics:
+    """Metrics for agent performance and resource usage.
+
+    Only running totals are stored; averages are derived on read so an
+    update is a couple of additions rather than a re-weighted mean.
+    """
+    total_successes: int = 0  # Number of successful operations
+    total_latency: float = 0.0  # Sum of operation latencies in seconds
+    token_usage: Dict[str, int] = field(default_factory=lambda: defaultdict(int))  # Token usage by model
+    last_updated: datetime = field(default_factory=lambda: datetime.now(UTC))  # Last time metrics were updated
+    total_operations: int = 0  # Total number of operations performed
+
+    @property
+    def success_rate(self) -> float:
+        """Success rate of operations."""
+        if not self.total_operations:
+            return 0.0
+        return self.total_successes / self.total_operations
+
+    @property
+    def average_latency(self) -> float:
+        """Average operation latency in seconds."""
+        if not self.total_operations:
+            return 0.0
+        return self.total_latency / self.total_operations
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the metrics, including derived averages, as a dictionary."""
+        data = asdict(self)
+        data["success_rate"] = self.success_rate
+        data["average_latency"] = self.average_latency
+        return data
+
+
+@dataclass(slots=True)
+class SystemMetrics:
     """System-wide metrics."""
-    model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "total_analyses": 100,
-                "total_duration": 123.45,
-                "average_duration": 1.23,
-                "cache_hits": 50,
-                "cache_misses": 50
-            }
-        }
-    )
-
-    total_analyses: int = Field(default=0, description="Total number of analyses performed")
-    total_duration: float = Field(default=0.0, description="Total duration of all analyses")
-    average_duration: float = Field(default=0.0, description="Average duration per analysis")
-    cache_hits: int = Field(default=0, description="Number of cache hits")
-    cache_misses: int = Field(default=0, description="Number of cache misses")
+    total_analyses: int = 0  # Total number of analyses performed
+    total_duration: float = 0.0  # Total duration of all analyses
+    cache_hits: int = 0  # Number of cache hits
+    cache_misses: int = 0  # Number of cache misses
+    cache_evictions: int = 0  # Number of cache evictions
+    inflight_joins: int = 0  # Number of requests that joined an identical running analysis
+
+    @property
+    def average_duration(self) -> float:
+        """Average duration per analysis."""
+        if not self.total_analyses:
+            return 0.0
+        return self.total_duration / self.total_analyses
+
+    def model_dump(self) -> Dict[str, Any]:
+        """Return the metrics, including derived averages, as a dictionary."""
+        data = asdict(self)
+        data["average_duration"] = self.average_duration
+        return data
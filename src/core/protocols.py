@@ -0,0 +1,31 @@
+"""Interfaces shared between the core system and its components.
+
+Kept free of heavy imports so retrieval and vector store modules can
+depend on them without loading the reasoning/LLM stack.
+"""
+
+from typing import Any, Dict, Optional, Protocol
+
+
+class AgentCoordinator(Protocol):
+    """Coordinator that adaptive components exchange context with."""
+
+    async def get_agent_context(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Get context about an agent, such as its ``window_size``.
+
+        Args:
+            agent_id: ID of the agent
+
+        Returns:
+            The agent's context, or None if unknown
+        """
+        ...
+
+    async def share_knowledge(self, source: str, knowledge: Dict[str, Any]) -> None:
+        """Publish insights learned by a component.
+
+        Args:
+            source: Name of the component sharing the knowledge
+            knowledge: Insights to share
+        """
+        ...
@@ -51,46 +51,70 @@ class GPT4MiniModel:
             "Authorization": f"Bearer {self.config.api_key}",
             "Content-Type": "application/json"
         }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled HTTP session, opening it on first use.
+
+        A single session keeps TCP/TLS connections alive across calls
+        instead of paying a fresh handshake per completion.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                )
+            )
+        return self._session
 
     async def generate(self, prompt: str) -> Dict[str, Any]:
         """Generate completion for prompt."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/completions",
-                    headers=self.headers,
-                    json={
-                        "prompt": prompt,
-                        "temperature": self.config.temperature,
-                        "max_tokens": self.config.max_tokens,
-                        "top_p": self.config.top_p,
-                        "frequency_penalty": self.config.frequency_penalty,
-                        "presence_penalty": self.config.presence_penalty,
-                        "stop": None
-                    }
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        raise Exception(
-                            f"GPT-4 Mini API error: {response.status} - {error_text}"
-                        )
-                    
-                    data = await response.json()
-                    
-                    return data
+            async with self._get_session().post(
+                f"{self.base_url}/completions",
+                json={
+                    "prompt": prompt,
+                    "temperature": self.config.temperature,
+                    "max_tokens": self.config.max_tokens,
+                    "top_p": self.config.top_p,
+                    "frequency_penalty": self.config.frequency_penalty,
+                    "presence_penalty": self.config.presence_penalty,
+                    "stop": None
+                }
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise Exception(
+                        f"GPT-4 Mini API error: {response.status} - {error_text}"
+                    )
+                
+                data = await response.json()
+                
+                return data
                     
         except aiohttp.ClientError as e:
             raise Exception(f"Network error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error generating completion: {str(e)}")
 
+    async def close(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def __aenter__(self):
         """Async context manager entry."""
+        self._get_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        pass  # No cleanup needed
+        await self.close()
 
 
 class GPT4MiniClient:
@@ -107,13 +131,14 @@ class GPT4MiniClient:
     
     async def __aenter__(self):
         """Enter async context."""
-        self._session = GPT4MiniModel(self.config)
+        self._session = await GPT4MiniModel(self.config).__aenter__()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Exit async context."""
         if self._session:
             await self._session.__aexit__(exc_type, exc_val, exc_tb)
+            self._session = None
     
     async def generate(
         self,
@@ -11,7 +11,7 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class MetadataRequest:
     """Configuration for metadata generation."""
     include_relationships: bool = True
@@ -20,7 +20,7 @@ class MetadataRequest:
     include_performance: bool = True
     max_context_window: int = 2_000_000  # 2M tokens for Gemini
 
-@dataclass
+@dataclass(slots=True)
 class CodeMetadata:
     """Rich metadata generated by LLM analysis."""
     # Core metadata
@@ -1,9 +1,21 @@
 """Legacy metadata extractor module for backward compatibility."""
 
+import warnings
+from functools import cache
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 
+@cache
+def _warn_deprecated() -> None:
+    """Emit the deprecation warning once per process."""
+    warnings.warn(
+        "MetadataExtractor is deprecated. Use MetadataGenerationAgent instead.",
+        DeprecationWarning,
+        stacklevel=3
+    )
+
+
 @dataclass
 class MetadataExtractor:
     """Legacy metadata extractor class.
@@ -14,12 +26,7 @@ class MetadataExtractor:
     
     def __init__(self):
         """Initialize the extractor."""
-        import warnings
-        warnings.warn(
-            "MetadataExtractor is deprecated. Use MetadataGenerationAgent instead.",
-            DeprecationWarning,
-            stacklevel=2
-        )
+        _warn_deprecated()
     
     async def extract_metadata(
         self,
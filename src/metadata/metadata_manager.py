@@ -1,9 +1,19 @@
 """Metadata management and processing module."""
 
 import ast
+import asyncio
+import builtins
+import hashlib
+import inspect
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from typing import Dict, Any, List, Optional, Tuple
 
+from ..core.cache import LRUKCache
 from .types import (
     CodeMetadata,
     MetadataRequest,
@@ -13,7 +23,63 @@ from .types import (
 )
 
 
-@dataclass
+# Extraction settings shared by every process_code_chunk call. Built from
+# constants, so Pydantic validation is skipped; the code itself is passed to
+# the agent separately and never read from the request.
+_CHUNK_REQUEST = MetadataRequest.model_construct(
+    extraction_level=MetadataExtractionLevel.STANDARD,
+    include_types=True,
+    include_dependencies=True,
+    max_dependency_depth=1,
+    include_docstrings=True,
+    include_comments=True
+)
+
+# The request above is fixed, so code and language fully determine a chunk's
+# metadata; results are cached by a digest of the code
+_CHUNK_CACHE_SIZE = 1024
+_chunk_cache = LRUKCache(_CHUNK_CACHE_SIZE)
+
+# Collected metadata of top-level definitions, keyed by the collectors that
+# were enabled and a digest of the definition's source. Lets a file where
+# one function changed skip re-walking the rest. Extraction runs in worker
+# threads, so access is serialized.
+_DEFINITION_CACHE_SIZE = 4096
+_definition_cache = LRUKCache(_DEFINITION_CACHE_SIZE)
+_definition_lock = threading.Lock()
+
+# Worker pools for process_code_chunks by max_workers, created on first use
+# and kept for the life of the process. Workers are spawned rather than
+# forked: a fork could copy _definition_lock while an extraction thread
+# holds it, deadlocking the child.
+_PROCESS_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_process_pools: Dict[Optional[int], ProcessPoolExecutor] = {}
+
+# Chunks handed to a worker per task, relative to the worker count; a few
+# tasks per worker balance the load without paying IPC per chunk
+_TASKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True, slots=True)
+class _DefinitionMetadata:
+    """Metadata collected from one top-level definition, as stored in the
+    definition cache. Only plain immutable collections are kept, so an entry
+    doesn't hold on to the visitor, agent or request that produced it.
+    """
+    imports: Tuple[str, ...]
+    functions: Tuple[Dict[str, Any], ...]
+    classes: Tuple[Dict[str, Any], ...]
+    types: Tuple[Tuple[str, str], ...]
+    dependencies: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    docstrings: Tuple[Tuple[str, str], ...]
+    modules: Tuple[str, ...]
+    bound: Tuple[str, ...]
+    calls: Tuple[str, ...]
+
+
+@dataclass(slots=True)
 class CodeChunk:
     """A chunk of code with its metadata."""
     code: str
@@ -27,6 +93,9 @@ class CodeChunk:
 async def process_code_chunk(code: str, language: str = "python") -> CodeMetadata:
     """Process a code chunk and extract its metadata.
     
+    Results are cached by content, so re-processing identical code skips
+    parsing entirely.
+    
     Args:
         code: The code to process
         language: The programming language of the code
@@ -34,17 +103,546 @@ async def process_code_chunk(code: str, language: str = "python") -> CodeMetadat
     Returns:
         Extracted metadata
     """
-    agent = MetadataGenerationAgent()
-    request = MetadataRequest(
-        code=code,
-        extraction_level=MetadataExtractionLevel.STANDARD,
-        include_types=True,
-        include_dependencies=True,
-        max_dependency_depth=1,
-        include_docstrings=True,
-        include_comments=True
-    )
-    return await agent.extract_metadata(code, language, request)
+    digest = hashlib.blake2b(code.encode(), digest_size=16).hexdigest()
+    cache_key = f"{language}:{digest}"
+    metadata = _chunk_cache.get(cache_key)
+    if metadata is None:
+        metadata = await _DEFAULT_AGENT.extract_metadata(code, language, _CHUNK_REQUEST)
+        _chunk_cache[cache_key] = metadata
+    # Callers may mutate the result, so never hand out the cached instance
+    return metadata.model_copy(deep=True)
+
+
+def clear_chunk_cache() -> None:
+    """Clear the process_code_chunk and per-definition result caches."""
+    _chunk_cache.clear()
+    with _definition_lock:
+        _definition_cache.clear()
+
+
+def _process_code_chunk_batch(batch: List[Tuple[str, str]]) -> List[CodeMetadata]:
+    """Extract the metadata of several (code, language) chunks in a worker process."""
+    return [
+        _DEFAULT_AGENT._extract_metadata_sync(code, language, _CHUNK_REQUEST)
+        for code, language in batch
+    ]
+
+
+def _get_process_pool(max_workers: Optional[int]) -> ProcessPoolExecutor:
+    """Get the shared worker pool for a worker count, starting it if needed."""
+    pool = _process_pools.get(max_workers)
+    if pool is None:
+        pool = _process_pools[max_workers] = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_PROCESS_POOL_CONTEXT
+        )
+    return pool
+
+
+def _discard_process_pool(max_workers: Optional[int], pool: ProcessPoolExecutor) -> None:
+    """Drop a broken worker pool so the next call starts a fresh one."""
+    if _process_pools.get(max_workers) is pool:
+        del _process_pools[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_process_pools() -> None:
+    """Shut down the worker pools used by process_code_chunks."""
+    while _process_pools:
+        _, pool = _process_pools.popitem()
+        pool.shutdown()
+
+
+async def _extract_in_process_pool(
+    work: List[Tuple[str, str]],
+    max_workers: Optional[int]
+) -> List[CodeMetadata]:
+    """Extract (code, language) chunks in batches across the worker pool.
+    
+    A pool whose worker died (e.g. killed for memory) stays broken, so it is
+    replaced and the work retried once before giving up.
+    """
+    loop = asyncio.get_running_loop()
+    workers = max_workers or os.cpu_count() or 1
+    size = -(-len(work) // (workers * _TASKS_PER_WORKER))
+    for attempt in range(2):
+        pool = _get_process_pool(max_workers)
+        try:
+            batches = await asyncio.gather(*(
+                loop.run_in_executor(pool, _process_code_chunk_batch, work[i:i + size])
+                for i in range(0, len(work), size)
+            ))
+        except BrokenProcessPool:
+            _discard_process_pool(max_workers, pool)
+            if attempt:
+                raise
+        else:
+            return [metadata for batch in batches for metadata in batch]
+
+
+async def process_code_chunks(
+    chunks: List[CodeChunk],
+    max_workers: Optional[int] = None
+) -> List[CodeMetadata]:
+    """Process many code chunks in parallel across worker processes.
+    
+    AST parsing is CPU-bound and holds the GIL, so chunks missing from the
+    process_code_chunk cache are fanned out in batches to a shared process
+    pool rather than run as concurrent tasks. Each chunk's metadata is also
+    stored on ``chunk.metadata``.
+    
+    Args:
+        chunks: The code chunks to process
+        max_workers: Maximum number of worker processes (defaults to CPU count)
+        
+    Returns:
+        Extracted metadata for each chunk, in input order
+    """
+    keys = [
+        f"{chunk.language}:{hashlib.blake2b(chunk.code.encode(), digest_size=16).hexdigest()}"
+        for chunk in chunks
+    ]
+    # Look each key up once; identical chunks are extracted once
+    found: Dict[str, CodeMetadata] = {}
+    missing: Dict[str, Tuple[str, str]] = {}
+    for key, chunk in zip(keys, chunks):
+        if key in found or key in missing:
+            continue
+        metadata = _chunk_cache.get(key)
+        if metadata is None:
+            missing[key] = (chunk.code, chunk.language)
+        else:
+            found[key] = metadata
+    
+    if len(missing) == 1:
+        (key, (code, language)), = missing.items()
+        found[key] = await _DEFAULT_AGENT.extract_metadata(code, language, _CHUNK_REQUEST)
+    elif missing:
+        extracted = await _extract_in_process_pool(list(missing.values()), max_workers)
+        found.update(zip(missing, extracted))
+    for key in missing:
+        _chunk_cache[key] = found[key]
+    
+    # Callers may mutate the results, so never hand out cached instances
+    results = [found[key].model_copy(deep=True) for key in keys]
+    for chunk, metadata in zip(chunks, results):
+        chunk.metadata = metadata
+    return results
+
+
+# Names every module can call without defining or importing them
+_BUILTIN_NAMES = frozenset(dir(builtins))
+
+# Statements whose metadata is cached per definition at module level
+_DEFINITION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# Leaf node types that never carry metadata (Load/Store, operators)
+_LEAF_TYPES = (ast.expr_context, ast.boolop, ast.operator, ast.unaryop, ast.cmpop)
+
+# Per node type, the fields that can hold child nodes worth visiting
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _classify_child_fields(node: ast.AST) -> Tuple[str, ...]:
+    """Work out which fields of a node's type can hold child nodes.
+    
+    A field's kind is fixed per node type, so this runs once per type, from
+    the first instance seen. Identifier/constant fields and leaf-only fields
+    are dropped; None and empty values are kept, since another instance may
+    fill them.
+    """
+    fields = []
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if type(value) is list:
+            value = value[0] if value else None
+        if value is None or (
+            isinstance(value, ast.AST) and not isinstance(value, _LEAF_TYPES)
+        ):
+            fields.append(field)
+    fields = _CHILD_FIELDS[type(node)] = tuple(fields)
+    return fields
+
+
+class _MetadataVisitor(ast.NodeVisitor):
+    """Single-pass collector for per-node code metadata.
+    
+    Imports, definitions, type annotations, name dependencies and docstrings
+    are all gathered in one traversal of the tree. Collectors that the request
+    doesn't ask for are skipped.
+    """
+
+    def __init__(
+        self,
+        agent: "MetadataGenerationAgent",
+        request: MetadataRequest,
+        source: Optional[str] = None
+    ):
+        """Initialize the visitor.
+        
+        Args:
+            agent: Agent providing the class/return-type helpers
+            request: Configuration for what metadata to collect
+            source: Source the tree was parsed from. If given, top-level
+                definitions are looked up in the definition cache by their
+                source text instead of always being walked.
+        """
+        super().__init__()
+        self.agent = agent
+        self.request = request
+        self.include_types = request.include_types
+        self.include_dependencies = request.include_dependencies
+        self.include_docstrings = request.include_docstrings
+        self.include_refs = (
+            request.extraction_level == MetadataExtractionLevel.COMPREHENSIVE
+        )
+        if self.include_refs:
+            self._dispatch = self._dispatch_with_refs
+        elif not self.include_dependencies:
+            self._dispatch = self._dispatch_without_dependencies
+        
+        self.imports: List[str] = []
+        self.functions: List[Dict[str, Any]] = []
+        self.classes: List[Dict[str, Any]] = []
+        self.types: Dict[str, str] = {}
+        # Scope -> names it loads; dicts act as insertion-ordered sets
+        self.dependencies: Dict[str, Dict[str, None]] = {}
+        self.docstrings: Dict[str, str] = {}
+        # Cross-file reference facts, collected at COMPREHENSIVE level only:
+        # imported modules (relative ones keep their leading dots), names the
+        # code binds, and bare names it calls
+        self.modules: Dict[str, None] = {}
+        self.bound: Dict[str, None] = {}
+        self.calls: Dict[str, None] = {}
+        
+        self.current_class: Optional[ast.ClassDef] = None
+        self.current_scope: Optional[str] = None
+        
+        # Annotation text by node id; argument annotations are read both by
+        # their function and by visit_arg, and return types by both the
+        # definition and type collectors
+        self._annotations: Dict[int, str] = {}
+        
+        self._lines: Optional[List[str]] = None
+        if source is not None:
+            # Match the parser's line numbering, which accepts \r and \r\n
+            if "\r" in source:
+                source = source.replace("\r\n", "\n").replace("\r", "\n")
+            self._lines = source.split("\n")
+            self._cache_prefix = (
+                f"{self.include_types:d}{self.include_dependencies:d}"
+                f"{self.include_docstrings:d}{self.include_refs:d}"
+            )
+
+    def visit(self, node: ast.AST) -> None:
+        handler = self._dispatch.get(type(node))
+        if handler is None:
+            self.generic_visit(node)
+        else:
+            handler(self, node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        dispatch = self._dispatch
+        fields = _CHILD_FIELDS.get(type(node))
+        if fields is None:
+            fields = _classify_child_fields(node)
+        for field in fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        handler = dispatch.get(type(item))
+                        if handler is None:
+                            self.generic_visit(item)
+                        else:
+                            handler(self, item)
+            elif isinstance(value, ast.AST):
+                handler = dispatch.get(type(value))
+                if handler is None:
+                    self.generic_visit(value)
+                else:
+                    handler(self, value)
+
+    def visit_Module(self, node: ast.Module) -> None:
+        if self._lines is None:
+            self.generic_visit(node)
+            return
+        dispatch = self._dispatch
+        for stmt in node.body:
+            if type(stmt) in _DEFINITION_TYPES:
+                self._visit_definition(stmt)
+            else:
+                handler = dispatch.get(type(stmt))
+                if handler is None:
+                    self.generic_visit(stmt)
+                else:
+                    handler(self, stmt)
+
+    def _visit_definition(self, node: ast.stmt) -> None:
+        """Collect a top-level definition, reusing a cached walk if possible.
+        
+        At module level a definition's metadata depends only on its own
+        source, so identical text gives identical results wherever it sits
+        in the file.
+        """
+        start = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+        text = "\n".join(self._lines[start - 1:node.end_lineno])
+        digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        cache_key = f"{self._cache_prefix}:{digest}"
+        with _definition_lock:
+            part = _definition_cache.get(cache_key)
+        if part is None:
+            visitor = _MetadataVisitor(self.agent, self.request)
+            visitor.visit(node)
+            part = _DefinitionMetadata(
+                imports=tuple(visitor.imports),
+                functions=tuple(visitor.functions),
+                classes=tuple(visitor.classes),
+                types=tuple(visitor.types.items()),
+                dependencies=tuple(
+                    (scope, tuple(names)) for scope, names in visitor.dependencies.items()
+                ),
+                docstrings=tuple(visitor.docstrings.items()),
+                modules=tuple(visitor.modules),
+                bound=tuple(visitor.bound),
+                calls=tuple(visitor.calls)
+            )
+            with _definition_lock:
+                _definition_cache[cache_key] = part
+        self._merge(part)
+
+    def _merge(self, part: _DefinitionMetadata) -> None:
+        """Add a definition's cached results, copying anything mutable."""
+        self.imports.extend(part.imports)
+        self.functions.extend(
+            {**info, "params": list(info["params"])} for info in part.functions
+        )
+        self.classes.extend(
+            {
+                **info,
+                "methods": list(info["methods"]),
+                "base_classes": list(info["base_classes"]),
+                "decorators": list(info["decorators"])
+            }
+            for info in part.classes
+        )
+        self.types.update(part.types)
+        for scope, names in part.dependencies:
+            existing = self.dependencies.get(scope)
+            if existing is None:
+                self.dependencies[scope] = dict.fromkeys(names)
+            else:
+                existing.update(dict.fromkeys(names))
+        self.docstrings.update(part.docstrings)
+        self.modules.update(dict.fromkeys(part.modules))
+        self.bound.update(dict.fromkeys(part.bound))
+        self.calls.update(dict.fromkeys(part.calls))
+
+    def unresolved_calls(self) -> List[str]:
+        """Get bare names the code calls without binding or importing them."""
+        bound = self.bound
+        return [
+            name for name in self.calls
+            if name not in bound and name not in _BUILTIN_NAMES
+        ]
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.imports.extend("import " + name.name for name in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        # "*" is just another name here, so one template covers every entry
+        prefix = f"from {node.module or ''} import "
+        self.imports.extend(prefix + name.name for name in node.names)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        if self.include_dependencies:
+            # Get base class dependencies
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    self._add_dependency(node.name, base.id)
+        if self.include_docstrings:
+            self._add_docstring(node)
+        
+        prev_class = self.current_class
+        self.current_class = node
+        self.generic_visit(node)
+        self.current_class = prev_class
+        
+        if not prev_class:  # Only add top-level classes
+            self.classes.append(self.agent._extract_class_info(node))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        name = self._add_function(node)
+        
+        if self.include_types:
+            if node.returns:
+                self.types[name] = self._annotation(node.returns)
+            for arg in node.args.args:
+                if arg.annotation:
+                    arg_name = f"{name}.{arg.arg}" if self.current_class else arg.arg
+                    self.types[arg_name] = self._annotation(arg.annotation)
+        if self.include_docstrings:
+            self._add_docstring(node)
+        
+        prev_scope = self.current_scope
+        if self.include_dependencies:
+            self.current_scope = name
+        self.generic_visit(node)
+        self.current_scope = prev_scope
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._add_function(node)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if self.include_types:
+            if isinstance(node.target, ast.Name):
+                name = node.target.id
+                if self.current_class:
+                    name = f"{self.current_class.name}.{name}"
+                self.types[name] = self._annotation(node.annotation)
+            elif isinstance(node.target, ast.Attribute):
+                if isinstance(node.target.value, ast.Name):
+                    name = f"{node.target.value.id}.{node.target.attr}"
+                    self.types[name] = self._annotation(node.annotation)
+        self.generic_visit(node)
+
+    def visit_arg(self, node: ast.arg) -> None:
+        if self.include_types and node.annotation:
+            self.types[node.arg] = self._annotation(node.annotation)
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if self.current_scope and isinstance(node.ctx, ast.Load):
+            self._add_dependency(self.current_scope, node.id)
+
+    def _add_function(self, node: ast.FunctionDef) -> str:
+        """Record a function or method definition.
+        
+        Returns:
+            The function's name, qualified by its enclosing class if any
+        """
+        name = node.name
+        if self.current_class:
+            name = f"{self.current_class.name}.{name}"
+        self.functions.append({
+            "name": name,
+            "params": [arg.arg for arg in node.args.args],
+            "return_type": self._annotation(node.returns) if node.returns else None
+        })
+        return name
+
+    def _annotation(self, node: ast.expr) -> str:
+        """Get the source text of an annotation, unparsing each node once."""
+        if isinstance(node, ast.Name):
+            return node.id
+        text = self._annotations.get(id(node))
+        if text is None:
+            text = self._annotations[id(node)] = ast.unparse(node)
+        return text
+
+    def _add_dependency(self, scope: str, dependency: str) -> None:
+        """Record that a scope depends on a name."""
+        names = self.dependencies.get(scope)
+        if names is None:
+            names = self.dependencies[scope] = {}
+        names[dependency] = None
+
+    def _add_docstring(self, node: ast.AST) -> None:
+        """Record a definition's docstring, if it has one."""
+        # Same check as ast.get_docstring, without its node-type validation
+        body = node.body
+        if body and isinstance(body[0], ast.Expr):
+            value = body[0].value
+            if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                docstring = inspect.cleandoc(value.value)
+                if docstring:
+                    self.docstrings[node.name] = docstring
+
+    # Handlers by exact node type. NodeVisitor.visit would build a
+    # "visit_<name>" string and getattr it for every node instead.
+    _dispatch = {
+        ast.Module: visit_Module,
+        ast.Import: visit_Import,
+        ast.ImportFrom: visit_ImportFrom,
+        ast.ClassDef: visit_ClassDef,
+        ast.FunctionDef: visit_FunctionDef,
+        ast.AsyncFunctionDef: visit_AsyncFunctionDef,
+        ast.AnnAssign: visit_AnnAssign,
+        ast.arg: visit_arg,
+        ast.Name: visit_Name,
+    }
+    
+    def _skip(self, node: ast.AST) -> None:
+        """Ignore a subtree that can't contribute metadata."""
+    
+    # Without dependency tracking, expressions contribute nothing: they can't
+    # contain imports or definitions, and annotations are read directly off
+    # their owning node. Skipping them prunes most of the tree.
+    _dispatch_without_dependencies = {
+        **dict.fromkeys(ast.expr.__subclasses__(), _skip),
+        **_dispatch,
+        ast.Name: _skip,
+    }
+
+    def _visit_Import_with_refs(self, node: ast.Import) -> None:
+        for name in node.names:
+            self.modules[name.name] = None
+            self.bound[name.asname or name.name.partition(".")[0]] = None
+        self.visit_Import(node)
+
+    def _visit_ImportFrom_with_refs(self, node: ast.ImportFrom) -> None:
+        self.modules["." * node.level + (node.module or "")] = None
+        for name in node.names:
+            if name.name != "*":
+                self.bound[name.asname or name.name] = None
+        self.visit_ImportFrom(node)
+
+    def _visit_ClassDef_with_refs(self, node: ast.ClassDef) -> None:
+        self.bound[node.name] = None
+        self.visit_ClassDef(node)
+
+    def _visit_FunctionDef_with_refs(self, node: ast.FunctionDef) -> None:
+        self.bound[node.name] = None
+        self.visit_FunctionDef(node)
+
+    def _visit_AsyncFunctionDef_with_refs(self, node: ast.AsyncFunctionDef) -> None:
+        self.bound[node.name] = None
+        self.visit_AsyncFunctionDef(node)
+
+    def _visit_arg_with_refs(self, node: ast.arg) -> None:
+        self.bound[node.arg] = None
+        self.visit_arg(node)
+
+    def _visit_Name_with_refs(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.visit_Name(node)
+        else:
+            self.bound[node.id] = None
+
+    def _visit_ExceptHandler_with_refs(self, node: ast.ExceptHandler) -> None:
+        if node.name:
+            self.bound[node.name] = None
+        self.generic_visit(node)
+
+    def _visit_Call_with_refs(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            self.calls[node.func.id] = None
+        self.generic_visit(node)
+
+    # Cross-file references need every name and call, so nothing is pruned
+    _dispatch_with_refs = {
+        **_dispatch,
+        ast.Import: _visit_Import_with_refs,
+        ast.ImportFrom: _visit_ImportFrom_with_refs,
+        ast.ClassDef: _visit_ClassDef_with_refs,
+        ast.FunctionDef: _visit_FunctionDef_with_refs,
+        ast.AsyncFunctionDef: _visit_AsyncFunctionDef_with_refs,
+        ast.arg: _visit_arg_with_refs,
+        ast.Name: _visit_Name_with_refs,
+        ast.ExceptHandler: _visit_ExceptHandler_with_refs,
+        ast.Call: _visit_Call_with_refs,
+    }
 
 
 class MetadataGenerationAgent:
@@ -62,6 +660,32 @@ class MetadataGenerationAgent:
     ) -> CodeMetadata:
         """Extract metadata from code using the configured metadata extraction pipeline.
 
+        Extraction is CPU-bound, so it runs in a worker thread to keep the
+        event loop responsive.
+
+        Args:
+            code_snippet: Code to extract metadata from
+            language: Programming language of the code
+            metadata_request: Configuration for what metadata to extract
+
+        Returns:
+            Extracted metadata information
+        """
+        return await asyncio.to_thread(
+            self._extract_metadata_sync,
+            code_snippet,
+            language,
+            metadata_request
+        )
+
+    def _extract_metadata_sync(
+        self,
+        code_snippet: str,
+        language: str,
+        metadata_request: MetadataRequest,
+    ) -> CodeMetadata:
+        """Extract metadata from code on the calling thread.
+
         Args:
             code_snippet: Code to extract metadata from
             language: Programming language of the code
@@ -71,54 +695,51 @@ class MetadataGenerationAgent:
             Extracted metadata information
         """
         try:
-            # Initialize with defaults
-            metadata = CodeMetadata(
-                imports=[],
-                functions=[],
-                classes=[],
-                types={},
-                dependencies={},
-                docstrings={},
-                comments=[],
-                success=True,
-                error=None
-            )
-            
-            # Parse AST and extract basic information
+            # Parse AST and collect all per-node metadata in a single pass
             tree = ast.parse(code_snippet)
+            visitor = _MetadataVisitor(self, metadata_request, code_snippet)
+            visitor.visit(tree)
             
-            # Extract imports
-            metadata.imports = self._extract_imports(tree)
-            
-            # Extract functions and classes
-            functions, classes = self._extract_definitions(tree)
-            metadata.functions = functions
-            metadata.classes = classes
-            
-            # Extract requested metadata
-            if metadata_request.include_types:
-                metadata.types = self._extract_types(tree)
-            if metadata_request.include_dependencies:
-                metadata.dependencies = self._extract_dependencies(tree)
-                metadata.dependency_depth = metadata_request.max_dependency_depth
-            if metadata_request.include_docstrings:
-                metadata.docstrings = self._extract_docstrings(tree)
-            if metadata_request.include_comments:
-                metadata.comments = self._extract_comments(tree)
-            
-            # Add deep analysis for DEEP level
-            if metadata_request.extraction_level in (
+            level = metadata_request.extraction_level
+            deep = level in (
                 MetadataExtractionLevel.DEEP,
                 MetadataExtractionLevel.COMPREHENSIVE
-            ):
-                metadata.control_flow = self._analyze_control_flow(tree)
-                metadata.data_flow = self._analyze_data_flow(tree)
-            
-            # Add cross-file analysis for COMPREHENSIVE level
-            if metadata_request.extraction_level == MetadataExtractionLevel.COMPREHENSIVE:
-                metadata.cross_file_refs = self._analyze_cross_file_refs(tree)
+            )
             
-            return metadata
+            # Build the result once from the final values; they come straight
+            # from the AST, so skip Pydantic validation. Collectors the
+            # request didn't enable are left empty by the visitor.
+            return CodeMetadata.model_construct(
+                imports=visitor.imports,
+                functions=visitor.functions,
+                classes=visitor.classes,
+                types=visitor.types,
+                dependencies={
+                    scope: list(names) for scope, names in visitor.dependencies.items()
+                },
+                dependency_depth=(
+                    metadata_request.max_dependency_depth
+                    if metadata_request.include_dependencies else None
+                ),
+                docstrings=visitor.docstrings,
+                comments=(
+                    self._extract_comments(tree)
+                    if metadata_request.include_comments else []
+                ),
+                # Deep analysis for DEEP level and above
+                control_flow=self._analyze_control_flow(tree) if deep else None,
+                data_flow=self._analyze_data_flow(tree) if deep else None,
+                # Cross-file analysis for COMPREHENSIVE level
+                cross_file_refs=(
+                    {
+                        "modules": list(visitor.modules),
+                        "unresolved_calls": visitor.unresolved_calls()
+                    }
+                    if visitor.include_refs else None
+                ),
+                success=True,
+                error=None
+            )
             
         except SyntaxError as e:
             return CodeMetadata(
@@ -137,71 +758,6 @@ class MetadataGenerationAgent:
                 error=f"Error during metadata extraction: {str(e)}"
             )
 
-    def _extract_imports(self, tree: ast.AST) -> List[str]:
-        """Extract import statements from AST."""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.append(f"import {name.name}")
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ""
-                for name in node.names:
-                    if name.name == "*":
-                        imports.append(f"from {module} import *")
-                    else:
-                        imports.append(f"from {module} import {name.name}")
-        return imports
-
-    def _extract_definitions(
-        self,
-        tree: ast.AST
-    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Extract function and class definitions from AST."""
-        class DefinitionVisitor(ast.NodeVisitor):
-            def __init__(self, agent):
-                super().__init__()
-                self.agent = agent
-                self.functions = []
-                self.classes = []
-                self.current_class = None
-                self.class_methods = {}
-            
-            def visit_FunctionDef(self, node):
-                self._handle_function(node)
-            
-            def visit_AsyncFunctionDef(self, node):
-                self._handle_function(node)
-            
-            def _handle_function(self, node):
-                function_info = {
-                    "name": node.name,
-                    "params": [arg.arg for arg in node.args.args],
-                    "return_type": self.agent._get_return_type(node)
-                }
-                
-                if self.current_class:
-                    function_info["name"] = f"{self.current_class.name}.{node.name}"
-                    methods = self.class_methods.setdefault(self.current_class.name, [])
-                    methods.append(node.name)
-                    self.functions.append(function_info)
-                else:
-                    self.functions.append(function_info)
-                self.generic_visit(node)
-            
-            def visit_ClassDef(self, node):
-                prev_class = self.current_class
-                self.current_class = node
-                self.generic_visit(node)
-                self.current_class = prev_class
-                
-                if not prev_class:  # Only add top-level classes
-                    self.classes.append(self.agent._extract_class_info(node))
-        
-        visitor = DefinitionVisitor(self)
-        visitor.visit(tree)
-        return visitor.functions, visitor.classes
-
     def _extract_class_info(self, node: ast.ClassDef) -> Dict[str, Any]:
         """Extract information about a class definition."""
         methods = []
@@ -209,130 +765,54 @@ class MetadataGenerationAgent:
             if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
                 methods.append(child.name)
         
+        base_classes = []
+        for base in node.bases:
+            name = self._get_name(base)
+            if name:
+                base_classes.append(name)
+        
+        decorators = []
+        for decorator in node.decorator_list:
+            # Report @decorator(...) by its callee
+            if isinstance(decorator, ast.Call):
+                decorator = decorator.func
+            name = self._get_name(decorator)
+            if name:
+                decorators.append(name)
+        
         return {
             "name": node.name,
             "methods": methods,
-            "base_classes": [base.id for base in node.bases if isinstance(base, ast.Name)],
-            "decorators": [d.id for d in node.decorator_list if isinstance(d, ast.Name)]
+            "base_classes": base_classes,
+            "decorators": decorators
         }
 
     def _get_name(self, node: ast.AST) -> str:
-        """Get the name from an AST node."""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_name(node.value)}.{node.attr}"
-        return ""
+        """Get the dotted name from a Name or Attribute chain.
+        
+        Returns an empty string if the chain doesn't start at a plain name
+        (e.g. ``factory().attr``).
+        """
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return ""
+        parts.append(node.id)
+        return ".".join(reversed(parts))
 
     def _get_return_type(self, node: ast.FunctionDef) -> Optional[str]:
         """Get the return type annotation from a function definition."""
-        if node.returns:
-            return ast.unparse(node.returns)
-        return None
-
-    def _extract_types(self, tree: ast.AST) -> Dict[str, str]:
-        """Extract type annotations from AST."""
-        class TypeVisitor(ast.NodeVisitor):
-            def __init__(self):
-                self.types = {}
-                self.current_class = None
-            
-            def visit_ClassDef(self, node):
-                prev_class = self.current_class
-                self.current_class = node
-                self.generic_visit(node)
-                self.current_class = prev_class
-            
-            def visit_FunctionDef(self, node):
-                if node.returns:
-                    name = node.name
-                    if self.current_class:
-                        name = f"{self.current_class.name}.{node.name}"
-                    self.types[name] = ast.unparse(node.returns)
-                
-                # Process function arguments
-                for arg in node.args.args:
-                    if arg.annotation:
-                        arg_name = arg.arg
-                        if self.current_class:
-                            arg_name = f"{self.current_class.name}.{node.name}.{arg_name}"
-                        self.types[arg_name] = ast.unparse(arg.annotation)
-                
-                self.generic_visit(node)
-            
-            def visit_AnnAssign(self, node):
-                if isinstance(node.target, ast.Name):
-                    name = node.target.id
-                    if self.current_class:
-                        name = f"{self.current_class.name}.{name}"
-                    self.types[name] = ast.unparse(node.annotation)
-                elif isinstance(node.target, ast.Attribute):
-                    if isinstance(node.target.value, ast.Name):
-                        name = f"{node.target.value.id}.{node.target.attr}"
-                        self.types[name] = ast.unparse(node.annotation)
-            
-            def visit_arg(self, node):
-                if node.annotation:
-                    self.types[node.arg] = ast.unparse(node.annotation)
-        
-        visitor = TypeVisitor()
-        visitor.visit(tree)
-        return visitor.types
-
-    def _extract_dependencies(self, tree: ast.AST) -> Dict[str, List[str]]:
-        """Extract dependencies from AST."""
-        dependencies = {}
-        
-        class DependencyVisitor(ast.NodeVisitor):
-            def __init__(self):
-                self.dependencies = {}
-                self.current_scope = None
-                self.current_class = None
-            
-            def visit_ClassDef(self, node):
-                prev_class = self.current_class
-                self.current_class = node
-                
-                # Get base class dependencies
-                for base in node.bases:
-                    if isinstance(base, ast.Name):
-                        self.add_dependency(node.name, base.id)
-                
-                self.generic_visit(node)
-                self.current_class = prev_class
-            
-            def visit_FunctionDef(self, node):
-                prev_scope = self.current_scope
-                scope_name = node.name
-                if self.current_class:
-                    scope_name = f"{self.current_class.name}.{node.name}"
-                self.current_scope = scope_name
-                
-                self.generic_visit(node)
-                self.current_scope = prev_scope
-            
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Load) and self.current_scope:
-                    self.add_dependency(self.current_scope, node.id)
-            
-            def add_dependency(self, scope: str, dependency: str):
-                if scope not in self.dependencies:
-                    self.dependencies[scope] = []
-                if dependency not in self.dependencies[scope]:
-                    self.dependencies[scope].append(dependency)
-        
-        visitor = DependencyVisitor()
-        visitor.visit(tree)
-        return visitor.dependencies
-
-    def _extract_docstrings(self, tree: ast.AST) -> Dict[str, str]:
-        """Extract docstrings from AST."""
-        docstrings = {}
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                if ast.get_docstring(node):
-                    docstrings[node.name] = ast.get_docstring(node)
-        return docstrings
+        returns = node.returns
+        if returns is None:
+            return None
+        # Most annotations are a bare name or None; skip the unparser for those
+        if isinstance(returns, ast.Name):
+            return returns.id
+        if isinstance(returns, ast.Constant) and returns.value is None:
+            return "None"
+        return ast.unparse(returns)
 
     def _extract_comments(self, tree: ast.AST) -> List[str]:
         """Extract comments from AST."""
@@ -349,11 +829,6 @@ class MetadataGenerationAgent:
         # Placeholder for data flow analysis
         return []
 
-    def _analyze_cross_file_refs(self, tree: ast.AST) -> Dict[str, List[str]]:
-        """Analyze cross-file references from AST."""
-        # Placeholder for cross-file reference analysis
-        return {}
-
     def _extract_function_info(self, node: ast.FunctionDef) -> Dict[str, Any]:
         """Extract information about a function definition."""
         return {
@@ -361,3 +836,7 @@ class MetadataGenerationAgent:
             "params": [arg.arg for arg in node.args.args],
             "return_type": self._get_return_type(node)
         }
+
+
+# The agent holds no state, so every chunk is processed by one shared instance
+_DEFAULT_AGENT = MetadataGenerationAgent()
@@ -15,6 +15,7 @@ context and metadata store.
 from typing import List, Type
 
 from .base import BaseAgent
+from .cache import AnalysisCache
 from .behavioral import BehavioralAnalysisAgent as BehavioralAnalyzer
 from .security import SecurityAnalysisAgent as SecurityAnalyzer
 from .patterns import PatternAnalysisAgent as PatternAnalyzer
@@ -24,6 +25,7 @@ from .system import ReasoningSystem
 
 __all__ = [
     "BaseAgent",
+    "AnalysisCache",
     "BehavioralAnalyzer",
     "SecurityAnalyzer",
     "PatternAnalyzer",
@@ -1,11 +1,14 @@
 """Base agent implementation for the reasoning system."""
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, TypedDict
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, TypedDict, ClassVar
+import asyncio
 import os
 import logging
 
-from pydantic import BaseModel, Field
+import openai
+from pydantic import BaseModel, Field, ValidationError
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.models.openai import OpenAIModel
 
@@ -18,10 +21,53 @@ from src.reasoning.types import (
     AgentDependencies,
     CodeUnderstandingLevel
 )
+from src.reasoning.agents.cache import AnalysisCache
 from src.retrieval.gemini import GeminiRetriever
 
 logger = logging.getLogger(__name__)
 
+# pydantic-ai Agents by (agent class, model name, API key). The system prompt
+# is fixed per class, so instances can share one Agent instead of each
+# building its own model client and schemas. Only string model names are
+# cached; a model object would be kept alive for the life of the process.
+_AGENT_CACHE: Dict[Tuple[type, str, Optional[str]], Agent] = {}
+
+# A response that fails ResponseData validation is sent back to the model
+# with the validation error, in the same conversation, up to this many times
+RESULT_RETRIES = 2
+
+# Transport failures worth restarting a whole analysis for; anything else
+# (including exhausted result retries) is raised straight away
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError
+)
+
+# In-flight context enrichments by (context id, extractor id, window size)
+_ENRICHMENTS: Dict[Tuple[int, int, int], "asyncio.Future[None]"] = {}
+
+# Context window size (tokens) by metadata extraction level
+_WINDOW_SIZES: Mapping[MetadataExtractionLevel, int] = MappingProxyType({
+    MetadataExtractionLevel.MINIMAL: 500_000,
+    MetadataExtractionLevel.STANDARD: 1_000_000,
+    MetadataExtractionLevel.DEEP: 1_500_000,
+    MetadataExtractionLevel.COMPREHENSIVE: 2_000_000
+})
+
+def _model_id(model: Any) -> str:
+    """Get a stable identifier for a model name, client or model object.
+    
+    Used in persistent cache keys, so it must not depend on anything
+    per-process such as an object's default repr.
+    """
+    if isinstance(model, str):
+        return model
+    name = getattr(getattr(model, "config", None), "model", None)
+    if not isinstance(name, str):
+        name = getattr(model, "model_name", None)
+    return name if isinstance(name, str) else type(model).__qualname__
+
 class ResponseDataDict(TypedDict):
     """Response data type for agent output."""
     agent_name: str
@@ -133,16 +179,28 @@ class BaseAnalysisAgent(BaseAgent):
 class BaseAgent(ABC):
     """Base class for all reasoning agents."""
 
+    # Built once per class rather than per request, so Pydantic validation
+    # doesn't run on every analysis
+    METADATA_REQUIREMENTS: ClassVar[MetadataRequest] = MetadataRequest(
+        extraction_level=MetadataExtractionLevel.STANDARD,
+        include_types=True,
+        include_dependencies=True
+    )
+
+    # Model used when none is passed in; agents can override it to pick a
+    # different tier
+    DEFAULT_MODEL: ClassVar[str] = "deepseek-chat"
+
     def __init__(
         self,
-        model: str = "deepseek-chat",
+        model: Optional[str] = None,
         metadata_extractor: Optional['MetadataGenerationAgent'] = None,
         gemini_retriever: Optional = None
     ):
         """Initialize the agent with necessary components.
         
         Args:
-            model: The model to use for analysis
+            model: The model to use for analysis (defaults to DEFAULT_MODEL)
             metadata_extractor: Component for extracting rich metadata
             gemini_retriever: Component for retrieving relevant context
         """
@@ -150,17 +208,29 @@ class BaseAgent(ABC):
         from tenacity import retry, stop_after_attempt, wait_exponential
         from pydantic_ai.models.openai import OpenAIModel
         
-        model = OpenAIModel(
-            model,
-            base_url="https://api.deepseek.com",
-            api_key=os.getenv("DEEPSEEK_API_KEY")
-        )
-        self.agent = Agent(
-            model,
-            deps_type='AgentDependencies',
-            result_type=ResponseData,
-            system_prompt=self.get_system_prompt()
-        )
+        model = model or self.DEFAULT_MODEL
+        api_key = os.getenv("DEEPSEEK_API_KEY")
+        cache_key = (type(self), model, api_key) if isinstance(model, str) else None
+        agent = _AGENT_CACHE.get(cache_key) if cache_key else None
+        if agent is None:
+            agent = Agent(
+                OpenAIModel(
+                    model,
+                    base_url="https://api.deepseek.com",
+                    api_key=api_key
+                ),
+                deps_type='AgentDependencies',
+                result_type=ResponseData,
+                system_prompt=self.get_system_prompt(),
+                result_retries=RESULT_RETRIES
+            )
+            if cache_key:
+                _AGENT_CACHE[cache_key] = agent
+        self.agent = agent
+        self.model_name = _model_id(model)
+        self.api_key = api_key
+        # Optional persistent cache of LLM responses; see _cached_run
+        self.result_cache: Optional[AnalysisCache] = None
         self.metadata_extractor = metadata_extractor or self._get_original_metadata_extractor()
         self.gemini_retriever = gemini_retriever
         self._setup_tools()
@@ -177,57 +247,115 @@ class BaseAgent(ABC):
         """Get the system prompt for this agent."""
         pass
 
-    @abstractmethod
     def get_metadata_requirements(self) -> MetadataRequest:
         """Get the metadata extraction requirements for this agent.
         
-        Override this method to specify what level of metadata extraction
-        your agent needs. By default, uses STANDARD level.
+        Override METADATA_REQUIREMENTS to specify what level of metadata
+        extraction your agent needs. By default, uses STANDARD level.
         
         Returns:
-            MetadataRequest configuration for this agent's needs
+            MetadataRequest configuration for this agent's needs (shared by
+            all instances of the class, so don't mutate it)
+        """
+        return self.METADATA_REQUIREMENTS
+
+    def _build_deps(self, code_context: CodeContext) -> AgentDependencies:
+        """Build the dependencies for an agent run on an enriched context.
+        
+        Uses the API key read when the agent was created, which is also the
+        key its model client was built with.
         """
-        return MetadataRequest(
-            extraction_level=MetadataExtractionLevel.STANDARD,
-            include_types=True,
-            include_dependencies=True
+        return AgentDependencies(
+            deepseek_api_key=self.api_key,
+            code_context=code_context,
+            retrieval_results=[]  # Will be populated by _enrich_context
         )
 
+    async def _cached_run(self, prompt: str, deps: AgentDependencies) -> ResponseData:
+        """Run the LLM agent, reusing a cached response when possible.
+        
+        Responses are keyed by model, system prompt and user prompt, so a
+        prompt change invalidates old entries automatically. Entries that no
+        longer validate against ResponseData are discarded and refetched.
+        
+        Args:
+            prompt: User prompt for the agent
+            deps: Dependencies for the agent run
+            
+        Returns:
+            The agent's response data
+        """
+        if self.result_cache is None:
+            return (await self.agent.run(prompt, deps=deps)).data
+        
+        # Cache reads and writes are file I/O (and writes may prune the
+        # directory), so they run off the event loop the agents share
+        key = AnalysisCache.make_key(self.model_name, self.get_system_prompt(), prompt)
+        cached = await asyncio.to_thread(self.result_cache.get, key)
+        if cached is not None:
+            try:
+                return ResponseData.model_validate(cached)
+            except ValidationError:
+                await asyncio.to_thread(self.result_cache.delete, key)
+        
+        data = (await self.agent.run(prompt, deps=deps)).data
+        await asyncio.to_thread(self.result_cache.put, key, data.model_dump(mode="json"))
+        return data
+
     def _setup_tools(self) -> None:
-        """Set up any tools needed by this agent."""
+        """Set up any tools needed by this agent.
+        
+        ``self.agent`` is shared by every instance of the class with the same
+        model and API key, so tools must only be registered on it once.
+        """
         pass
 
     async def _enrich_context(self, code_context: CodeContext) -> CodeContext:
-        """Enrich code context with metadata."""
+        """Enrich code context with metadata.
+        
+        ReasoningSystem runs its agents concurrently on one context, so
+        concurrent calls for the same context, extractor and window size
+        share a single extraction instead of each extracting and extending
+        the context again. A context that already carries metadata (e.g.
+        from an earlier agent in a sequential pipeline) is returned as is.
+        """
+        if code_context.metadata is not None:
+            return code_context
         try:
-            metadata = await self.metadata_extractor.extract_metadata(
-                code_context,
-                window_size=self._calculate_window_size(self.get_metadata_requirements())
-            )
-            
-            # Update imports and dependencies from metadata
-            if metadata.imports:
-                code_context.imports.extend(metadata.imports)
-            if metadata.dependencies:
-                code_context.dependencies.extend(list(metadata.dependencies.keys()))
-            
-            # Set the metadata field
-            code_context.metadata = metadata
-            
+            window_size = self._calculate_window_size(self.get_metadata_requirements())
+            key = (id(code_context), id(self.metadata_extractor), window_size)
+            task = _ENRICHMENTS.get(key)
+            if task is None:
+                task = _ENRICHMENTS[key] = asyncio.ensure_future(
+                    self._apply_metadata(code_context, window_size)
+                )
+                task.add_done_callback(lambda _: _ENRICHMENTS.pop(key, None))
+            # A timed-out agent must not cancel the extraction for the others
+            await asyncio.shield(task)
             return code_context
         except Exception as e:
             logging.error(f"Failed to enrich context: {e}")
             return code_context
 
+    async def _apply_metadata(self, code_context: CodeContext, window_size: int) -> None:
+        """Extract metadata for a context and merge it into the context."""
+        metadata = await self.metadata_extractor.extract_metadata(
+            code_context,
+            window_size=window_size
+        )
+        
+        # Update imports and dependencies from metadata
+        if metadata.imports:
+            code_context.imports.extend(metadata.imports)
+        if metadata.dependencies:
+            code_context.dependencies.extend(metadata.dependencies)
+        
+        # Set the metadata field
+        code_context.metadata = metadata
+
     def _calculate_window_size(self, request: MetadataRequest) -> int:
         """Calculate appropriate context window size based on extraction level."""
-        base_sizes = {
-            MetadataExtractionLevel.MINIMAL: 500_000,
-            MetadataExtractionLevel.STANDARD: 1_000_000,
-            MetadataExtractionLevel.DEEP: 1_500_000,
-            MetadataExtractionLevel.COMPREHENSIVE: 2_000_000
-        }
-        return base_sizes.get(request.extraction_level, 1_000_000)  # Default to STANDARD size
+        return _WINDOW_SIZES.get(request.extraction_level, 1_000_000)  # Default to STANDARD size
 
     def _get_original_metadata_extractor(self):
         from src.metadata.metadata_manager import MetadataGenerationAgent as OriginalMetadataGenerationAgent
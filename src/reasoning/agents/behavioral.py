@@ -17,16 +17,14 @@ from .base import BaseAgent, ResponseDataDict
 
 class BehavioralAnalysisAgent(BaseAgent):
     """Agent for analyzing code behavior and side effects."""
-    
-    def get_metadata_requirements(self) -> MetadataRequest:
-        """Get metadata requirements for behavioral analysis."""
-        return MetadataRequest(
-            extraction_level=MetadataExtractionLevel.DEEP,
-            include_types=True,
-            include_dependencies=True,
-            include_docstrings=True,
-            include_comments=True
-        )
+
+    METADATA_REQUIREMENTS = MetadataRequest(
+        extraction_level=MetadataExtractionLevel.DEEP,
+        include_types=True,
+        include_dependencies=True,
+        include_docstrings=True,
+        include_comments=True
+    )
     
     def get_system_prompt(self) -> str:
         """Get system prompt for behavioral analysis."""
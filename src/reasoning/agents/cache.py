@@ -0,0 +1,172 @@
+"""Content-addressed cache for agent LLM responses.
+
+Responses are stored as JSON files named by a SHA-256 digest of everything
+that determines them (model, system prompt, user prompt), so re-running an
+analysis over unchanged code costs a hash and a file read instead of an
+LLM call. The directory is capped at a number of entries; the oldest
+entries are removed once it grows past that.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# Default cap on stored responses. Entries are a few KB each, so this keeps
+# the directory in the tens of megabytes.
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Fraction of the cap kept after pruning, so the directory scan is paid once
+# per many writes rather than on every write past the cap
+_PRUNE_TO = 0.9
+
+
+class AnalysisCache:
+    """File-backed cache of agent responses.
+
+    Metadata:
+        - Performance: Skips repeated LLM calls
+        - Persistence: Survives process restarts
+        - Optimization: Bounded number of entries
+        - Monitoring: Hit/miss counters
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store cache entries in (created if missing)
+            max_entries: Maximum number of entries to keep on disk
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._entries = sum(1 for _ in self.cache_dir.glob("*.json"))
+        # Agents call in from worker threads; guards the counters and pruning
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a cache key from the inputs that determine a response.
+
+        Each part is length-prefixed before hashing, so different splits of
+        the same text (e.g. moving a line between prompts) never collide.
+
+        Args:
+            parts: Strings identifying the request
+
+        Returns:
+            Hex SHA-256 digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part.encode()
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Get the file holding a key's entry."""
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached value, or None if missing or unreadable
+        """
+        try:
+            entry = json.loads(self._path(key).read_text())
+            value = entry["value"]
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            # Truncated or foreign file; drop it so it gets rewritten
+            self.delete(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a JSON-serializable value.
+
+        The entry is written to a temporary file and renamed into place, so
+        concurrent readers never see a partial entry. If the cache grows past
+        max_entries, the oldest entries are removed.
+
+        Args:
+            key: Key from make_key
+            value: Value to cache
+        """
+        path = self._path(key)
+        is_new = not path.exists()
+        entry = {"created_at": datetime.now(UTC).isoformat(), "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if is_new:
+            with self._lock:
+                self._entries += 1
+                if self._entries > self.max_entries:
+                    self._prune()
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._entries -= 1
+
+    def _prune(self) -> None:
+        """Remove the oldest entries, leaving a margin below max_entries.
+
+        Called with the lock held.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                entries.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                # Removed by another process sharing the directory
+                continue
+        entries.sort()
+        excess = len(entries) - int(self.max_entries * _PRUNE_TO)
+        for _, path in entries[:max(0, excess)]:
+            Path(path).unlink(missing_ok=True)
+        self._entries = len(entries) - max(0, excess)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        total_requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total_requests if total_requests > 0 else 0
+        }
@@ -1,15 +1,22 @@
 """Dependency analysis agent for understanding code dependencies and relationships."""
 
-import os
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
-from .base import BaseAgent
-from ..types import AgentAnalysis, AgentDependencies, CodeContext, DependencyInfo, MetadataRequest, MetadataExtractionLevel
+from .base import BaseAgent, TRANSIENT_ERRORS
+from ..types import AgentAnalysis, CodeContext, DependencyInfo, MetadataRequest, MetadataExtractionLevel
 
 
 class DependencyAnalysisAgent(BaseAgent):
     """Analyzes code dependencies and relationships."""
 
+    METADATA_REQUIREMENTS = MetadataRequest(
+        extraction_level=MetadataExtractionLevel.DEEP,
+        include_types=True,
+        include_dependencies=True,
+        include_docstrings=True,
+        include_comments=True
+    )
+
     def get_system_prompt(self) -> str:
         return (
             "You are an expert in analyzing code dependencies and relationships. "
@@ -26,30 +33,20 @@ class DependencyAnalysisAgent(BaseAgent):
             "5. Consider behavioral implications"
         )
 
-    def get_metadata_requirements(self) -> MetadataRequest:
-        """Get metadata requirements for dependency analysis."""
-        return MetadataRequest(
-            extraction_level=MetadataExtractionLevel.DEEP,
-            include_types=True,
-            include_dependencies=True,
-            include_docstrings=True,
-            include_comments=True
-        )
-
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
     async def analyze(self, code_context: CodeContext) -> DependencyInfo:
         """Analyze code dependencies."""
         # Enrich context with metadata and related information
         enriched_context = await self._enrich_context(code_context)
         
-        deps = AgentDependencies(
-            deepseek_api_key=os.getenv("DEEPSEEK_API_KEY"),
-            code_context=enriched_context,
-            retrieval_results=[]  # Will be populated by _enrich_context
-        )
+        deps = self._build_deps(enriched_context)
         
-        result = await self.agent.run(
+        data = await self._cached_run(
             f"Analyze dependencies in this code:\n{enriched_context.code_snippet}",
             deps=deps
         )
-        return DependencyInfo(**result.data.findings.get("dependencies", {}))
+        return DependencyInfo(**data.findings.get("dependencies", {}))
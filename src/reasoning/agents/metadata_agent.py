@@ -3,6 +3,7 @@ Specialized agent for generating rich code metadata using GPT-4-mini.
 """
 
 import logging
+import sys
 from typing import Dict, Any, Optional
 import json
 from datetime import datetime
@@ -10,18 +11,47 @@ from datetime import datetime
 from ...llm.gpt4_mini import GPT4MiniClient, GPT4MiniModel
 from ..types import (
     AgentAnalysis,
+    AnalysisType,
     CodeContext,
     CodeUnderstandingLevel,
     MetadataRequest,
     MetadataExtractionLevel,
-    CodeMetadata
+    CodeMetadata,
+    Severity
+)
+from ...metadata.types import (
+    MetadataExtractionLevel as ExtractionLevel,
+    MetadataRequest as ExtractionRequest
 )
 from .base import BaseAgent
 from ...retrieval.gemini import GeminiRetriever
 
+# Snippets up to this length are described from the AST alone; retrieval
+# adds little beyond what the code itself shows
+MIN_RETRIEVAL_CHARS = 200
+
+# Fields of the reasoning CodeMetadata, all of which the extractor also fills
+_METADATA_FIELDS = tuple(CodeMetadata.model_fields)
+
+# Fields that retrieved context may provide, overriding the local extraction
+_RETRIEVED_FIELDS = (
+    "imports", "functions", "classes", "types", "dependencies", "docstrings", "comments"
+)
+
 
 class MetadataGenerationAgent(BaseAgent):
     """Agent for generating rich metadata about code."""
+
+    # COMPREHENSIVE so extraction also reports cross-file references, which
+    # decide whether retrieval is needed
+    METADATA_REQUIREMENTS = MetadataRequest(
+        extraction_level=MetadataExtractionLevel.COMPREHENSIVE,
+        include_types=True,
+        include_dependencies=True,
+        max_dependency_depth=2,
+        include_docstrings=True,
+        include_comments=True
+    )
     
     def __init__(
         self,
@@ -51,17 +81,6 @@ class MetadataGenerationAgent(BaseAgent):
         Respond with structured metadata that can be directly parsed into the CodeMetadata type.
         Focus on being precise and concise in your analysis."""
     
-    def get_metadata_requirements(self) -> MetadataRequest:
-        """Get metadata extraction requirements."""
-        return MetadataRequest(
-            extraction_level=MetadataExtractionLevel.DEEP,
-            include_types=True,
-            include_dependencies=True,
-            max_dependency_depth=2,
-            include_docstrings=True,
-            include_comments=True
-        )
-    
     async def extract_metadata(self, code_context: CodeContext, window_size: Optional[int] = None) -> CodeMetadata:
         """Extract metadata from code context.
         
@@ -75,38 +94,26 @@ class MetadataGenerationAgent(BaseAgent):
         # Get metadata requirements
         requirements = self.get_metadata_requirements()
         
-        # Initialize metadata with empty values
-        metadata = CodeMetadata()
-        
-        try:
-            # Extract basic metadata
-            metadata.imports = self._extract_imports(code_context.code_snippet)
-            metadata.functions = self._extract_functions(code_context.code_snippet)
-            metadata.classes = self._extract_classes(code_context.code_snippet)
-            
-            # Extract additional metadata based on requirements
-            if requirements.include_types:
-                metadata.types = self._extract_types(code_context.code_snippet)
-            
-            if requirements.include_dependencies:
-                metadata.dependencies = self._extract_dependencies(
-                    code_context.code_snippet,
-                    requirements.max_dependency_depth
-                )
-            
-            if requirements.include_docstrings:
-                metadata.docstrings = self._extract_docstrings(code_context.code_snippet)
-            
-            if requirements.include_comments:
-                metadata.comments = self._extract_comments(code_context.code_snippet)
-            
-            metadata.success = True
-            
-        except Exception as e:
-            metadata.success = False
-            metadata.error = str(e)
-        
-        return metadata
+        # Every field comes out of one ast.parse and a single visitor pass in
+        # the shared extractor, rather than a separate scan per field
+        request = ExtractionRequest.model_construct(
+            extraction_level=ExtractionLevel(requirements.extraction_level.value),
+            include_types=requirements.include_types,
+            include_dependencies=requirements.include_dependencies,
+            max_dependency_depth=requirements.max_dependency_depth,
+            include_docstrings=requirements.include_docstrings,
+            include_comments=requirements.include_comments
+        )
+        metadata = await self.metadata_extractor.extract_metadata(
+            code_context.code_snippet,
+            code_context.language,
+            request
+        )
+        # The extractor's model is a superset of ours and already validated,
+        # so its field values are carried over as-is
+        return CodeMetadata.model_construct(**{
+            name: getattr(metadata, name) for name in _METADATA_FIELDS
+        })
     
     async def analyze(self, context: CodeContext) -> AgentAnalysis:
         """Analyze code and generate rich metadata.
@@ -118,23 +125,40 @@ class MetadataGenerationAgent(BaseAgent):
             Agent analysis containing generated metadata
         """
         try:
-            # First use Gemini for context retrieval
+            # Self-contained snippets don't need the retrieval round-trip
+            local_metadata = await self.extract_metadata(context)
+            if not self._needs_retrieval(context, local_metadata):
+                return AgentAnalysis(
+                    agent_name=self.name,
+                    understanding_level=CodeUnderstandingLevel.SURFACE,
+                    findings=local_metadata.model_dump(),
+                    confidence=0.9,
+                    supporting_evidence=[
+                        f"Analyzed {len(context.code_snippet)} lines of code",
+                        "Snippet is self-contained; metadata extracted from its AST",
+                        "Skipped context retrieval"
+                    ],
+                    analysis_type=AnalysisType.METADATA,
+                    severity=Severity.INFO
+                )
+            
+            # Otherwise use Gemini for context retrieval
             relevant_context = await self.gemini_retriever.get_context(
                 context.code_snippet,
                 max_tokens=2_000_000  # Use full 2M token window
             )
             
-            # Generate metadata from the context
-            metadata = CodeMetadata(
-                imports=relevant_context.get("imports", []),
-                functions=relevant_context.get("functions", []),
-                classes=relevant_context.get("classes", []),
-                types=relevant_context.get("types", {}),
-                dependencies=relevant_context.get("dependencies", {}),
-                docstrings=relevant_context.get("docstrings", {}),
-                comments=relevant_context.get("comments", []),
-                success=True
-            )
+            # Layer the retrieved fields over the local extraction, which
+            # still covers anything retrieval didn't return
+            metadata = CodeMetadata(**{
+                **dict(local_metadata),
+                **{
+                    field: relevant_context[field]
+                    for field in _RETRIEVED_FIELDS if field in relevant_context
+                },
+                "success": True,
+                "error": None
+            })
             
             return AgentAnalysis(
                 agent_name=self.name,
@@ -145,7 +169,9 @@ class MetadataGenerationAgent(BaseAgent):
                     f"Analyzed {len(context.code_snippet)} lines of code",
                     f"Incorporated {len(str(relevant_context))} tokens of context",
                     "Generated comprehensive metadata structure"
-                ]
+                ],
+                analysis_type=AnalysisType.METADATA,
+                severity=Severity.INFO
             )
             
         except Exception as e:
@@ -159,9 +185,42 @@ class MetadataGenerationAgent(BaseAgent):
                     "Error occurred during metadata generation",
                     f"Error type: {type(e).__name__}"
                 ],
+                analysis_type=AnalysisType.METADATA,
+                severity=Severity.ERROR,
                 warnings=[str(e)]
             )
     
+    def _needs_retrieval(self, context: CodeContext, metadata: CodeMetadata) -> bool:
+        """Decide whether a snippet needs retrieved context.
+        
+        Retrieval is skipped for short snippets, and for snippets that only
+        import from the standard library and only call names they define,
+        import or get from builtins, since there is no other code for it to
+        find. Relative imports count as project code. This reads the
+        cross-file references from the snippet's extraction rather than
+        parsing it again; snippets that didn't parse, or whose extraction
+        has no references, always go through retrieval.
+        
+        Args:
+            context: Context about the code being analyzed
+            metadata: Metadata extracted from the snippet's AST
+            
+        Returns:
+            True if the snippet should be analyzed with retrieved context
+        """
+        if not metadata.success:
+            return True
+        if len(context.code_snippet) <= MIN_RETRIEVAL_CHARS:
+            return False
+        refs = metadata.cross_file_refs
+        if refs is None:
+            return True
+        for module in refs.get("modules", []):
+            if module.startswith(".") or module.partition(".")[0] not in sys.stdlib_module_names:
+                return True
+        # Calls to names from nowhere in the snippet reach into other code
+        return bool(refs.get("unresolved_calls"))
+    
     def _build_analysis_prompt(
         self,
         context: CodeContext,
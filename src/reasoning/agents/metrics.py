@@ -1,10 +1,9 @@
 """Metrics analysis agent for evaluating code quality and complexity."""
 
-import os
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
-from .base import BaseAgent
-from ..types import AgentAnalysis, AgentDependencies, CodeContext, CodeMetrics, MetadataExtractionLevel
+from .base import BaseAgent, TRANSIENT_ERRORS
+from ..types import AgentAnalysis, CodeContext, CodeMetrics, MetadataExtractionLevel
 
 
 class MetricsAnalysisAgent(BaseAgent):
@@ -26,20 +25,20 @@ class MetricsAnalysisAgent(BaseAgent):
         
         Provide detailed analysis of code metrics and suggest improvements."""
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @retry(
+        retry=retry_if_exception_type(TRANSIENT_ERRORS),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10)
+    )
     async def analyze(self, code_context: CodeContext) -> CodeMetrics:
         """Analyze code for quality metrics."""
         # Enrich context with metadata and related information
         enriched_context = await self._enrich_context(code_context)
         
-        deps = AgentDependencies(
-            deepseek_api_key=os.getenv("DEEPSEEK_API_KEY"),
-            code_context=enriched_context,
-            retrieval_results=[]  # Will be populated by _enrich_context
-        )
+        deps = self._build_deps(enriched_context)
         
-        result = await self.agent.run(
+        data = await self._cached_run(
             f"Calculate metrics for this code:\n{enriched_context.code_snippet}",
             deps=deps
         )
-        return CodeMetrics(**result.data.findings.get("metrics", {}))
+        return CodeMetrics(**data.findings.get("metrics", {}))
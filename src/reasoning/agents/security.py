@@ -17,6 +17,14 @@ from .base import BaseAgent, ResponseData
 
 class SecurityAnalysisAgent(BaseAgent):
     """Agent for analyzing code security."""
+
+    METADATA_REQUIREMENTS = MetadataRequest(
+        extraction_level=MetadataExtractionLevel.DEEP,
+        include_types=True,
+        include_dependencies=True,
+        include_docstrings=True,
+        include_comments=True
+    )
     
     def __init__(
         self,
@@ -37,16 +45,6 @@ class SecurityAnalysisAgent(BaseAgent):
         self.logger = logging.getLogger("agent.security")
         self.metadata_extractor = metadata_extractor
     
-    def get_metadata_requirements(self) -> MetadataRequest:
-        """Get metadata requirements for security analysis."""
-        return MetadataRequest(
-            extraction_level=MetadataExtractionLevel.DEEP,
-            include_types=True,
-            include_dependencies=True,
-            include_docstrings=True,
-            include_comments=True
-        )
-    
     def get_system_prompt(self) -> str:
         """Get system prompt for security analysis."""
         return """You are a specialized code analysis agent focused on security analysis.
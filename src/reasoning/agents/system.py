@@ -19,6 +19,7 @@ from ..types import (
     DependencyInfo
 )
 from .base import BaseAgent
+from .cache import AnalysisCache
 from .metadata_agent import MetadataGenerationAgent
 from .patterns import PatternAnalysisAgent
 from .security import SecurityAnalysisAgent
@@ -37,7 +38,8 @@ class ReasoningSystem:
         self,
         metadata_extractor: MetadataGenerationAgent,
         gemini_retriever: GeminiRetriever,
-        model: Optional[GPT4MiniModel] = None
+        model: Optional[GPT4MiniModel] = None,
+        result_cache: Optional[AnalysisCache] = None
     ):
         """Initialize the reasoning system.
         
@@ -45,6 +47,7 @@ class ReasoningSystem:
             metadata_extractor: Agent for generating metadata
             gemini_retriever: Retriever for similar code examples
             model: Optional GPT4Mini model for analysis
+            result_cache: Optional cache of LLM responses shared by all agents
         """
         self.metadata_extractor = metadata_extractor
         self.gemini_retriever = gemini_retriever
@@ -84,6 +87,8 @@ class ReasoningSystem:
             "metrics": self.metrics_agent,
             "dependency": self.dependency_agent
         }
+        for agent in self.agents.values():
+            agent.result_cache = result_cache
     
     @classmethod
     def create_default(
@@ -1,23 +1,43 @@
 """Adaptive retriever with learning capabilities for improved code search."""
 
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 
 from .gemini import GeminiRetriever
 from .types import RetrievalQuery, RetrievalResult
-from ..core.coordinator import AgentCoordinator
+from ..core.protocols import AgentCoordinator
 
+# Number of recent example queries kept per learned pattern
+MAX_PATTERN_EXAMPLES = 5
 
-class QueryPattern(BaseModel):
+# Weights for query complexity factors: words, filters, exact phrases,
+# code context, metadata
+_WORDS_WEIGHT = 0.3
+_FILTERS_WEIGHT = 0.2
+_PHRASES_WEIGHT = 0.1
+_CONTEXT_WEIGHT = 0.2
+_METADATA_WEIGHT = 0.2
+_TOTAL_WEIGHT = (
+    _WORDS_WEIGHT + _FILTERS_WEIGHT + _PHRASES_WEIGHT
+    + _CONTEXT_WEIGHT + _METADATA_WEIGHT
+)
+
+
+@dataclass(slots=True)
+class QueryPattern:
     """Pattern discovered in queries."""
     pattern_type: str
     frequency: int
     success_rate: float
-    last_seen: datetime
-    examples: List[str] = Field(default_factory=list)
+    last_seen: float  # time.monotonic() of the last matching query
+    examples: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=MAX_PATTERN_EXAMPLES)
+    )  # Most recent examples
 
 
 class SearchStrategy(BaseModel):
@@ -29,13 +49,13 @@ class SearchStrategy(BaseModel):
     success_rate: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryPerformance:
     """Performance metrics for queries."""
     total_queries: int = 0
     successful_queries: int = 0
     avg_latency: float = 0.0
-    last_updated: datetime = datetime.now()
+    last_updated: datetime = field(default_factory=datetime.now)
 
 
 class AdaptiveRetriever(GeminiRetriever):
@@ -96,7 +116,7 @@ class AdaptiveRetriever(GeminiRetriever):
         
         try:
             # Perform retrieval with selected strategy
-            start_time = datetime.now()
+            start_time = time.perf_counter()
             result = await super().retrieve(
                 enhanced_query,
                 similarity_threshold=strategy.similarity_threshold,
@@ -106,7 +126,7 @@ class AdaptiveRetriever(GeminiRetriever):
             )
             
             # Update performance metrics
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
             await self._update_performance(
                 strategy_name=self._get_strategy_name(strategy),
                 success=True,
@@ -162,20 +182,16 @@ class AdaptiveRetriever(GeminiRetriever):
         query: RetrievalQuery
     ) -> float:
         """Estimate query complexity (0-1)."""
-        # Consider various query aspects
-        factors = [
-            len(query.text.split()),  # Number of words
-            len(query.filters or []),  # Number of filters
-            query.text.count('"'),     # Exact phrase matches
-            bool(query.code_context),  # Has code context
-            bool(query.metadata)       # Has metadata
-        ]
-        
-        # Normalize and combine factors
-        weights = [0.3, 0.2, 0.1, 0.2, 0.2]
-        return sum(
-            f * w for f, w in zip(factors, weights)
-        ) / sum(weights)
+        # Weighted sum of query aspects, normalized by the total weight
+        text = query.text
+        score = (
+            len(text.split()) * _WORDS_WEIGHT  # Number of words
+            + len(query.filters or ()) * _FILTERS_WEIGHT  # Number of filters
+            + text.count('"') * _PHRASES_WEIGHT  # Exact phrase matches
+            + bool(query.code_context) * _CONTEXT_WEIGHT  # Has code context
+            + bool(query.metadata) * _METADATA_WEIGHT  # Has metadata
+        )
+        return score / _TOTAL_WEIGHT
 
     async def _enhance_query(
         self,
@@ -248,25 +264,21 @@ class AdaptiveRetriever(GeminiRetriever):
         """Learn patterns from successful retrievals."""
         # Analyze query structure
         if query.filters:
+            now = time.monotonic()
             pattern_type = "filter_enhancement"
-            if pattern_type not in self.query_patterns:
-                self.query_patterns[pattern_type] = QueryPattern(
+            pattern = self.query_patterns.get(pattern_type)
+            if pattern is None:
+                pattern = self.query_patterns[pattern_type] = QueryPattern(
                     pattern_type=pattern_type,
-                    frequency=1,
-                    success_rate=1.0,
-                    last_seen=datetime.now(),
-                    examples=[str(query.filters)]
-                )
-            else:
-                pattern = self.query_patterns[pattern_type]
-                pattern.frequency += 1
-                pattern.success_rate = (
-                    (pattern.success_rate * (pattern.frequency - 1) + 1.0)
-                    / pattern.frequency
+                    frequency=0,
+                    success_rate=0.0,
+                    last_seen=now
                 )
-                pattern.last_seen = datetime.now()
-                if len(pattern.examples) < 5:
-                    pattern.examples.append(str(query.filters))
+            
+            pattern.frequency += 1
+            pattern.success_rate += (1.0 - pattern.success_rate) / pattern.frequency
+            pattern.last_seen = now
+            pattern.examples.append(str(query.filters))
 
     def _get_strategy_name(
         self,
@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 
 from .pipeline import Pipeline
 from .schema import CodeChunkMetadata
-from ..core.coordinator import AgentCoordinator
+from ..core.protocols import AgentCoordinator
 
 
 class ChunkingStrategy(BaseModel):
@@ -29,7 +29,7 @@ class EmbeddingStats(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ChunkPerformance:
     """Performance metrics for a chunking strategy."""
     retrieval_success: int = 0
@@ -3,7 +3,7 @@ Client configuration for Qdrant vector database.
 """
 
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from qdrant_client import QdrantClient
@@ -13,7 +13,8 @@ class QdrantConfig(BaseSettings):
     """Configuration for Qdrant client."""
     url: str = "localhost"
     port: int = 6333
-    prefer_grpc: bool = False
+    grpc_port: int = 6334
+    prefer_grpc: bool = True
     api_key: Optional[str] = None
     openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
     gemini_api_key: Optional[str] = Field(None, env="GEMINI_API_KEY")
@@ -26,13 +27,31 @@ class QdrantConfig(BaseSettings):
         extra="allow"  
     )
 
-_client: Optional[QdrantClient] = None
+# HTTP/2 flow-control windows sized for large vector/metadata payloads; the
+# 64 KB gRPC default caps throughput well below what the link can carry.
+GRPC_OPTIONS = {
+    "grpc.http2.initial_window_size": 16 * 1024 * 1024,
+    "grpc.http2.initial_connection_window_size": 32 * 1024 * 1024,
+    "grpc.max_receive_message_length": 64 * 1024 * 1024,
+}
 
-def get_qdrant_client() -> QdrantClient:
+_clients: Dict[bool, QdrantClient] = {}
+
+@lru_cache(maxsize=1)
+def _get_config() -> QdrantConfig:
+    """Load the Qdrant settings once per process."""
+    return QdrantConfig()
+
+def get_qdrant_client(prefer_grpc: Optional[bool] = None) -> QdrantClient:
     """
     Returns a configured Qdrant client with connection pooling.
     Uses singleton pattern to avoid multiple client instances.
     
+    Args:
+        prefer_grpc: Override the configured transport. REST can beat gRPC
+            for small payloads carrying large strings, so callers on such
+            paths may ask for the REST client explicitly.
+    
     Returns:
         QdrantClient: Configured Qdrant client instance
     
@@ -40,22 +59,26 @@ def get_qdrant_client() -> QdrantClient:
         - Dependencies: QdrantConfig
         - Error Handling: Connection validation
         - Performance: GRPC/HTTP2 support, Connection pooling
-        - Pattern: Singleton
+        - Pattern: Singleton per transport
     """
-    global _client
+    config = _get_config()
+    use_grpc = config.prefer_grpc if prefer_grpc is None else prefer_grpc
     
-    if _client is None:
-        config = QdrantConfig()
-        
+    client = _clients.get(use_grpc)
+    if client is None:
         client_kwargs = {
             "url": config.url,
             "port": config.port,
-            "prefer_grpc": config.prefer_grpc
+            "prefer_grpc": use_grpc
         }
         
+        if use_grpc:
+            client_kwargs["grpc_port"] = config.grpc_port
+            client_kwargs["grpc_options"] = GRPC_OPTIONS
+        
         if config.api_key:
             client_kwargs["api_key"] = config.api_key
             
-        _client = QdrantClient(**client_kwargs)
+        client = _clients[use_grpc] = QdrantClient(**client_kwargs)
     
-    return _client
+    return client
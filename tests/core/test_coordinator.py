@@ -1,10 +1,13 @@
 """Tests for the system coordinator."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 import json
 from datetime import datetime
+from pydantic import ValidationError
 
+from src.core.cache import LRUKCache
 from src.core.coordinator import SystemCoordinator
 from src.config import ResourceConfig
 from src.core.metrics import AgentMetrics, SystemMetrics
@@ -147,3 +150,207 @@ async def test_cache_management(coordinator, test_analysis):
     assert coordinator.cache[cache_key] == test_analysis
     coordinator.clear_cache()
     assert len(coordinator.cache) == 0
+
+def test_cache_evicts_single_use_entries_first():
+    """Test LRU-2 eviction keeps reused keys over one-shot keys."""
+    cache = LRUKCache(maxsize=2)
+    cache["hot"] = 1
+    _ = cache["hot"]
+    cache["cold"] = 2
+    cache["new"] = 3
+    assert "hot" in cache
+    assert "cold" not in cache
+    assert cache.evictions == 1
+
+def test_cache_evicts_least_recently_reused_when_all_reused():
+    """Test eviction falls back to the least recently used reused key."""
+    cache = LRUKCache(maxsize=2)
+    for key in ("a", "b"):
+        cache[key] = key
+        _ = cache[key]
+    _ = cache["a"]
+    cache["c"] = "c"
+    assert set(cache) == {"a", "c"}
+    del cache["c"]
+    cache["d"] = "d"
+    assert set(cache) == {"a", "d"}
+    assert cache.evictions == 1
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_analysis(coordinator, test_code_context, test_analysis):
+    """Test identical in-flight requests only run the analysis once."""
+    async def slow_analyze(**kwargs):
+        await asyncio.sleep(0.01)
+        return test_analysis
+
+    with patch.object(coordinator.reasoning, 'analyze', side_effect=slow_analyze) as mock:
+        results = await asyncio.gather(*[
+            coordinator.analyze_code(test_code_context, cache_key="same")
+            for _ in range(3)
+        ])
+        assert mock.call_count == 1
+        assert all(r == test_analysis for r in results)
+        assert coordinator.system_metrics.cache_misses == 1
+        assert coordinator.system_metrics.inflight_joins == 2
+        assert coordinator.system_metrics.cache_hits == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_waiter(coordinator, test_code_context, test_analysis):
+    """Test a waiter takes over an in-flight analysis whose leader is cancelled."""
+    started = asyncio.Event()
+    calls = 0
+
+    async def analyze(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            started.set()
+            await asyncio.sleep(10)
+        return test_analysis
+
+    with patch.object(coordinator.reasoning, 'analyze', side_effect=analyze):
+        leader = asyncio.create_task(
+            coordinator.analyze_code(test_code_context, cache_key="same")
+        )
+        await started.wait()
+        followers = [
+            asyncio.create_task(
+                coordinator.analyze_code(test_code_context, cache_key="same")
+            )
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        results = await asyncio.wait_for(asyncio.gather(*followers), timeout=1)
+        assert results == [test_analysis, test_analysis]
+        assert leader.cancelled()
+        assert calls == 2
+        assert not coordinator._inflight
+
+@pytest.mark.asyncio
+async def test_create_builds_components(config):
+    """Test async construction wires the same components as __init__."""
+    coordinator = await SystemCoordinator.create(
+        gpt4_mini_key="test_key",
+        gemini_key="test_key",
+        config=config
+    )
+    assert coordinator.config == config
+    assert coordinator.gemini is not None
+    assert coordinator.gpt4_mini is not None
+    assert coordinator.reasoning.gemini_retriever is coordinator.gemini
+
+def test_metrics_are_slotted_and_dumpable():
+    """Test metrics serialize via model_dump and reject unknown fields."""
+    metrics = AgentMetrics(token_usage={"gemini": 1})
+    assert metrics.model_dump()["token_usage"] == {"gemini": 1}
+    assert SystemMetrics().model_dump()["cache_evictions"] == 0
+    with pytest.raises(AttributeError):
+        metrics.unknown = 1
+
+def test_metric_averages_derived_from_totals():
+    """Test averages are computed from running totals."""
+    metrics = AgentMetrics(total_successes=3, total_latency=2.0, total_operations=4)
+    assert metrics.success_rate == 0.75
+    assert metrics.average_latency == 0.5
+    assert AgentMetrics().success_rate == 0.0
+    assert SystemMetrics(total_analyses=2, total_duration=3.0).average_duration == 1.5
+
+@pytest.mark.asyncio
+async def test_token_usage_attributed_per_agent(coordinator, test_code_context, test_analysis):
+    """Test each agent is credited only with its own token usage."""
+    other = test_analysis.agent_analyses[0].model_copy(update={
+        "agent_name": "other_agent",
+        "findings": {"token_usage": {"gemini": 7}}
+    })
+    analysis = test_analysis.model_copy(update={
+        "agent_analyses": test_analysis.agent_analyses + [other]
+    })
+    with patch.object(coordinator.reasoning, 'analyze', return_value=analysis):
+        await coordinator.analyze_code(test_code_context)
+        metrics = coordinator.get_metrics()
+        assert metrics["test_agent"].token_usage == {"gemini": 100, "gpt4_mini": 50}
+        assert metrics["other_agent"].token_usage == {"gemini": 7}
+        assert metrics["test_agent"].last_updated == metrics["other_agent"].last_updated
+
+@pytest.mark.asyncio
+async def test_batch_analyze_partial_failure(coordinator, test_code_context, test_analysis):
+    """Test a failing context doesn't discard the other results."""
+    error = Exception("Test error")
+    with patch.object(
+        coordinator.reasoning, 'analyze', side_effect=[test_analysis, error, test_analysis]
+    ):
+        results = await coordinator.batch_analyze([test_code_context] * 3)
+        assert results[0] == test_analysis
+        assert results[1] is error
+        assert results[2] == test_analysis
+
+@pytest.mark.asyncio
+async def test_metrics_view_and_snapshot(coordinator, test_code_context, test_analysis):
+    """Test get_metrics is a live read-only view and snapshot is a stable copy."""
+    with patch.object(coordinator.reasoning, 'analyze', return_value=test_analysis):
+        view = coordinator.get_metrics()
+        await coordinator.analyze_code(test_code_context)
+        assert view["test_agent"].total_operations == 1
+        with pytest.raises(TypeError):
+            view["test_agent"] = AgentMetrics()
+
+        snapshot = coordinator.snapshot()
+        await coordinator.analyze_code(test_code_context)
+        assert snapshot["test_agent"].total_operations == 1
+        assert snapshot["test_agent"].token_usage == {"gemini": 100, "gpt4_mini": 50}
+        assert view["test_agent"].total_operations == 2
+
+def test_metrics_view_lookup_does_not_create_entries(coordinator):
+    """Test a missing-key lookup on the metrics view leaves state unchanged."""
+    view = coordinator.get_metrics()
+    with pytest.raises(KeyError):
+        view["nonexistent"]
+    assert "nonexistent" not in coordinator.agent_metrics
+    assert not coordinator.agent_metrics
+
+def test_default_config_shared():
+    """Test coordinators without a config share the frozen default."""
+    first = SystemCoordinator(gpt4_mini_key="a", gemini_key="b")
+    second = SystemCoordinator(gpt4_mini_key="a", gemini_key="b")
+    assert first.config is second.config
+    with pytest.raises(ValidationError):
+        first.config.max_parallel_agents = 10
+
+@pytest.mark.asyncio
+async def test_reasoning_concurrency_bounded(coordinator, test_code_context, test_analysis, config):
+    """Test no more than max_parallel_agents analyses run at once."""
+    running = 0
+    peak = 0
+
+    async def tracked_analyze(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return test_analysis
+
+    with patch.object(coordinator.reasoning, 'analyze', side_effect=tracked_analyze):
+        await coordinator.batch_analyze([test_code_context] * 6)
+        assert peak == config.max_parallel_agents
+
+@pytest.mark.asyncio
+async def test_latency_excludes_queueing(coordinator, test_code_context, test_analysis, config):
+    """Test recorded durations cover the analysis, not the wait for a slot."""
+    async def slow_analyze(**kwargs):
+        await asyncio.sleep(0.05)
+        return test_analysis
+
+    with patch.object(coordinator.reasoning, 'analyze', side_effect=slow_analyze):
+        await coordinator.batch_analyze([test_code_context] * 8)
+
+    # 8 analyses of 0.05s through 2 slots; queueing would add another 0.6s
+    assert coordinator.system_metrics.total_duration < 0.6
+    assert coordinator.get_metrics()["test_agent"].average_latency < 0.075
+
+def test_client_configs_validate_keys(config):
+    """Test API keys passed to the coordinator are validated, not trusted."""
+    with pytest.raises(ValidationError):
+        SystemCoordinator(gpt4_mini_key=None, gemini_key="test_key", config=config)
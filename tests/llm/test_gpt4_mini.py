@@ -115,3 +115,22 @@ async def test_client_error_handling(client):
         async with client as c:
             with pytest.raises(Exception, match="GPT-4 Mini API error: 500 - Internal Server Error"):
                 await c.generate("Test prompt")
+
+
+@pytest.mark.asyncio
+async def test_session_reused_across_calls(client):
+    """Test one HTTP session serves every call within the context."""
+    with patch("aiohttp.ClientSession.post") as mock_post:
+        mock_response = AsyncMock()
+        mock_response.json.return_value = {"choices": []}
+        mock_response.status = 200
+        mock_post.return_value.__aenter__.return_value = mock_response
+        
+        async with client as c:
+            http_session = c._session._session
+            await c.generate("first")
+            await c.generate("second")
+            assert c._session._session is http_session
+            assert mock_post.call_count == 2
+        
+        assert http_session.closed
@@ -1,6 +1,9 @@
 """Unit tests for metadata generation agent."""
 
+import threading
+
 import pytest
+from src.metadata import metadata_manager
 from src.metadata.metadata_manager import MetadataGenerationAgent
 from src.metadata.types import MetadataRequest, MetadataExtractionLevel
 
@@ -190,3 +193,212 @@ async def test_extract_metadata_with_different_levels(agent, sample_code):
     )
     assert deep_metadata.success
     assert deep_metadata.dependencies is not None
+
+
+@pytest.mark.asyncio
+async def test_extract_return_types(agent):
+    """Test return annotations are reported for simple and compound types."""
+    code = """
+import pathlib
+
+def count() -> int:
+    return 0
+
+def reset() -> None:
+    pass
+
+def home() -> pathlib.Path:
+    return pathlib.Path.home()
+
+def names() -> list[str]:
+    return []
+
+def untyped():
+    pass
+"""
+    request = MetadataRequest(code=code, extraction_level=MetadataExtractionLevel.MINIMAL)
+    metadata = await agent.extract_metadata(code, "python", request)
+    
+    return_types = {f["name"]: f["return_type"] for f in metadata.functions}
+    assert return_types == {
+        "count": "int",
+        "reset": "None",
+        "home": "pathlib.Path",
+        "names": "list[str]",
+        "untyped": None
+    }
+
+
+@pytest.mark.asyncio
+async def test_extract_all_collectors_in_one_pass(agent):
+    """Test definitions, types, dependencies and docstrings agree in one pass."""
+    code = """
+class Base:
+    pass
+
+class Worker(Base):
+    \"\"\"Does work.\"\"\"
+    limit: int
+
+    def run(self, jobs: list) -> int:
+        \"\"\"Run jobs.\"\"\"
+        return len(jobs)
+"""
+    request = MetadataRequest(code=code, extraction_level=MetadataExtractionLevel.STANDARD)
+    metadata = await agent.extract_metadata(code, "python", request)
+    
+    assert [f["name"] for f in metadata.functions] == ["Worker.run"]
+    assert [c["name"] for c in metadata.classes] == ["Base", "Worker"]
+    assert metadata.types == {
+        "Worker.limit": "int",
+        "Worker.run": "int",
+        "Worker.run.jobs": "list",
+        "jobs": "list"
+    }
+    assert {scope: set(deps) for scope, deps in metadata.dependencies.items()} == {
+        "Worker": {"Base"},
+        "Worker.run": {"list", "int", "len", "jobs"}
+    }
+    assert metadata.docstrings == {"Worker": "Does work.", "run": "Run jobs."}
+    
+    minimal = await agent.extract_metadata(
+        code,
+        "python",
+        MetadataRequest(
+            code=code,
+            extraction_level=MetadataExtractionLevel.MINIMAL,
+            include_types=False,
+            include_dependencies=False,
+            include_docstrings=False
+        )
+    )
+    assert minimal.functions == metadata.functions
+    assert minimal.types == {}
+    assert minimal.dependencies == {}
+    assert minimal.docstrings == {}
+
+
+@pytest.mark.asyncio
+async def test_extract_metadata_runs_off_event_loop(agent, sample_code):
+    """Test extraction runs in a worker thread, not on the event loop."""
+    threads = []
+    extract = agent._extract_metadata_sync
+    
+    def record_thread(*args):
+        threads.append(threading.get_ident())
+        return extract(*args)
+    
+    agent._extract_metadata_sync = record_thread
+    request = MetadataRequest(code=sample_code)
+    metadata = await agent.extract_metadata(sample_code, "python", request)
+    
+    assert metadata.success
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_child_fields_classified_from_sparse_first_node(agent, monkeypatch):
+    """Test field classification isn't misled by the first node of a type."""
+    monkeypatch.setattr(metadata_manager, "_CHILD_FIELDS", {})
+    code = """
+def stub():
+    pass
+
+@register
+def outer(x: int):
+    import json
+    class Inner:
+        pass
+    return json.dumps(x)
+"""
+    request = MetadataRequest(code=code, extraction_level=MetadataExtractionLevel.STANDARD)
+    metadata = await agent.extract_metadata(code, "python", request)
+    
+    assert [f["name"] for f in metadata.functions] == ["stub", "outer"]
+    assert [c["name"] for c in metadata.classes] == ["Inner"]
+    assert metadata.imports == ["import json"]
+    assert set(metadata.dependencies["outer"]) == {"register", "int", "json", "x"}
+
+
+@pytest.mark.asyncio
+async def test_reextraction_reuses_unchanged_definitions(agent, monkeypatch):
+    """Test re-extracting edited code only walks the definitions that changed."""
+    monkeypatch.setattr(metadata_manager, "_definition_cache", metadata_manager.LRUKCache(64))
+    original = """
+import os
+
+def first(path: str) -> bool:
+    \"\"\"Check a path.\"\"\"
+    return os.path.exists(path)
+
+class Config(Base):
+    name: str
+
+    def load(self, key: str) -> dict:
+        return {key: self.name}
+
+def last(value):
+    return value
+"""
+    edited = """
+import os
+
+class Config(Base):
+    name: str
+
+    def load(self, key: str) -> dict:
+        return {key: self.name}
+
+def first(path: str) -> bool:
+    \"\"\"Check a path.\"\"\"
+    return os.path.isfile(path)
+
+def last(value):
+    return value
+"""
+    request = MetadataRequest(code=original, extraction_level=MetadataExtractionLevel.STANDARD)
+    await agent.extract_metadata(original, "python", request)
+    assert len(metadata_manager._definition_cache) == 3
+    # Entries hold plain results, not the visitor (and its agent/request)
+    assert all(
+        isinstance(part, metadata_manager._DefinitionMetadata)
+        for part in metadata_manager._definition_cache.values()
+    )
+    
+    # Moving Config is a cache hit; only the edited body of first is new
+    metadata = await agent.extract_metadata(edited, "python", request)
+    assert len(metadata_manager._definition_cache) == 4
+    
+    monkeypatch.setattr(metadata_manager, "_definition_cache", metadata_manager.LRUKCache(64))
+    fresh = await agent.extract_metadata(edited, "python", request)
+    assert metadata.model_dump() == fresh.model_dump()
+    assert metadata.classes[0] is not fresh.classes[0]
+    assert set(metadata.dependencies["first"]) == {"bool", "str", "os", "path"}
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_extraction_reports_cross_file_refs(agent):
+    """Test modules and calls to names the code never binds are reported."""
+    code = """
+from .types import Config
+import os.path as osp
+
+def run(paths, callback):
+    loaded = [load(p) for p in paths]
+    callback(loaded)
+    try:
+        return helper(osp.join(*paths)) + len(loaded)
+    except ValueError as err:
+        return Config(err)
+"""
+    request = MetadataRequest(extraction_level=MetadataExtractionLevel.COMPREHENSIVE)
+
+    for _ in range(2):  # second pass reads definitions from the cache
+        metadata = await agent.extract_metadata(code, "python", request)
+        assert metadata.cross_file_refs == {
+            "modules": [".types", "os.path"],
+            "unresolved_calls": ["load", "helper"]
+        }
+
+    deep = MetadataRequest(extraction_level=MetadataExtractionLevel.DEEP)
+    assert (await agent.extract_metadata(code, "python", deep)).cross_file_refs is None
@@ -0,0 +1,207 @@
+"""Tests for the base reasoning agent."""
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.llm.gpt4_mini import GPT4MiniClient, GPT4MiniConfig
+from src.reasoning.agents import base
+from src.reasoning.agents.base import ResponseData
+from src.reasoning.agents.behavioral import BehavioralAnalysisAgent
+from src.reasoning.agents.cache import AnalysisCache
+from src.reasoning.agents.dependencies import DependencyAnalysisAgent
+from src.reasoning.agents.metadata_agent import MetadataGenerationAgent
+from src.reasoning.agents.security import SecurityAnalysisAgent
+from src.reasoning.types import CodeContext, CodeMetadata, CodeUnderstandingLevel
+
+
+@pytest.fixture(autouse=True)
+def agent_cache(monkeypatch):
+    """Give each test an empty Agent cache and a DeepSeek API key."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    monkeypatch.setattr(base, "_AGENT_CACHE", {})
+
+
+def test_agent_shared_per_class_and_model():
+    """Test instances of one class reuse a single pydantic-ai Agent."""
+    first = DependencyAnalysisAgent()
+    second = DependencyAnalysisAgent()
+
+    assert first.agent is second.agent
+    assert SecurityAnalysisAgent().agent is not first.agent
+    assert DependencyAnalysisAgent(model="deepseek-coder").agent is not first.agent
+
+
+def test_agent_not_cached_for_model_objects():
+    """Test model objects aren't held in the module-level Agent cache."""
+    model = MagicMock()
+    DependencyAnalysisAgent(model=model)
+
+    assert not base._AGENT_CACHE
+
+
+def test_agent_rebuilt_for_new_api_key(monkeypatch):
+    """Test a changed API key isn't served a client built with the old one."""
+    first = DependencyAnalysisAgent()
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "rotated-key")
+
+    assert DependencyAnalysisAgent().agent is not first.agent
+
+
+@pytest.mark.asyncio
+async def test_concurrent_enrichment_extracts_once():
+    """Test agents enriching one context concurrently share an extraction."""
+    calls = []
+
+    async def extract_metadata(code_context, window_size=None):
+        calls.append(window_size)
+        await asyncio.sleep(0)
+        return CodeMetadata(imports=["import os"], dependencies={"run": ["os"]})
+
+    extractor = MagicMock(spec=MetadataGenerationAgent)
+    extractor.extract_metadata = extract_metadata
+    context = CodeContext(
+        code_snippet="import os\n\ndef run():\n    os.getcwd()",
+        file_path="run.py",
+        start_line=1,
+        end_line=4,
+        language="python",
+        understanding_level=CodeUnderstandingLevel.SURFACE
+    )
+    agents = [
+        DependencyAnalysisAgent(metadata_extractor=extractor),
+        BehavioralAnalysisAgent(metadata_extractor=extractor)
+    ]
+
+    await asyncio.gather(*(agent._enrich_context(context) for agent in agents))
+
+    assert len(calls) == 1
+    assert context.imports == ["import os"]
+    assert context.dependencies == ["run"]
+    assert not base._ENRICHMENTS
+
+
+@pytest.mark.asyncio
+async def test_cached_run_reuses_response(tmp_path):
+    """Test a repeated prompt is answered from the result cache."""
+    agent = DependencyAnalysisAgent()
+    agent.result_cache = AnalysisCache(tmp_path)
+    response = ResponseData(
+        agent_name="dependency",
+        understanding_level="structural",
+        findings={"dependencies": {}},
+        confidence=0.9,
+        supporting_evidence=[]
+    )
+    agent.agent = MagicMock()
+    agent.agent.run = AsyncMock(return_value=MagicMock(data=response))
+
+    first = await agent._cached_run("Analyze dependencies", deps=None)
+    second = await agent._cached_run("Analyze dependencies", deps=None)
+    await agent._cached_run("Analyze other code", deps=None)
+
+    assert first == second == response
+    assert agent.agent.run.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_run_does_file_io_off_event_loop(tmp_path):
+    """Test result cache reads and writes run in worker threads."""
+    cache = AnalysisCache(tmp_path)
+    threads = []
+
+    def record(method):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return method(*args)
+        return wrapper
+
+    cache.get = record(cache.get)
+    cache.put = record(cache.put)
+    agent = DependencyAnalysisAgent()
+    agent.result_cache = cache
+    agent.agent = MagicMock()
+    agent.agent.run = AsyncMock(return_value=MagicMock(data=ResponseData(
+        agent_name="dependency",
+        understanding_level="structural",
+        findings={},
+        confidence=0.9,
+        supporting_evidence=[]
+    )))
+
+    await agent._cached_run("Analyze dependencies", deps=None)
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+def test_default_model_per_agent_class():
+    """Test agents fall back to their class's DEFAULT_MODEL."""
+    class LiteDependencyAgent(DependencyAnalysisAgent):
+        DEFAULT_MODEL = "deepseek-lite"
+
+    assert DependencyAnalysisAgent(model=None).model_name == "deepseek-chat"
+    assert LiteDependencyAgent().model_name == "deepseek-lite"
+    assert LiteDependencyAgent(model="deepseek-chat").model_name == "deepseek-chat"
+
+
+def test_model_name_stable_for_client_objects():
+    """Test result cache keys use the client's model, not its per-process repr."""
+    client = GPT4MiniClient(GPT4MiniConfig(api_key="test-key"))
+
+    assert DependencyAnalysisAgent(model=client).model_name == "gpt-4o-mini"
+
+
+@pytest.mark.asyncio
+async def test_only_transient_errors_restart_analysis(monkeypatch):
+    """Test invalid results are retried in-session, not by restarting analyze."""
+    agent = DependencyAnalysisAgent()
+    assert agent.agent._max_result_retries == base.RESULT_RETRIES
+
+    enrich = AsyncMock(side_effect=ValueError("bad context"))
+    monkeypatch.setattr(agent, "_enrich_context", enrich)
+    with pytest.raises(ValueError):
+        await agent.analyze(MagicMock())
+    assert enrich.await_count == 1
+
+
+def test_build_deps_uses_client_api_key(monkeypatch):
+    """Test run dependencies carry the key the agent's client was built with."""
+    agent = DependencyAnalysisAgent()
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "rotated-key")
+
+    deps = agent._build_deps(CodeContext(
+        code_snippet="x = 1",
+        file_path="x.py",
+        start_line=1,
+        end_line=1,
+        language="python",
+        understanding_level=CodeUnderstandingLevel.SURFACE
+    ))
+
+    assert deps.deepseek_api_key == "test-key"
+    assert deps.retrieval_results == []
+
+
+@pytest.mark.asyncio
+async def test_sequential_enrichment_reuses_metadata():
+    """Test an already-enriched context isn't extracted or extended again."""
+    extractor = MagicMock(spec=MetadataGenerationAgent)
+    extractor.extract_metadata = AsyncMock(
+        return_value=CodeMetadata(imports=["import os"], dependencies={"run": ["os"]})
+    )
+    context = CodeContext(
+        code_snippet="import os",
+        file_path="run.py",
+        start_line=1,
+        end_line=1,
+        language="python",
+        understanding_level=CodeUnderstandingLevel.SURFACE
+    )
+
+    await DependencyAnalysisAgent(metadata_extractor=extractor)._enrich_context(context)
+    await BehavioralAnalysisAgent(metadata_extractor=extractor)._enrich_context(context)
+
+    assert extractor.extract_metadata.await_count == 1
+    assert context.imports == ["import os"]
@@ -0,0 +1,48 @@
+"""Tests for the agent response cache."""
+import os
+
+from src.reasoning.agents.cache import AnalysisCache
+
+
+def test_round_trip_and_stats(tmp_path):
+    """Test values survive a new cache instance over the same directory."""
+    cache = AnalysisCache(tmp_path / "responses")
+    key = AnalysisCache.make_key("model", "system", "prompt")
+
+    assert cache.get(key) is None
+    cache.put(key, {"findings": {"a": 1}})
+
+    reopened = AnalysisCache(tmp_path / "responses")
+    assert reopened.get(key) == {"findings": {"a": 1}}
+    assert cache.get_stats()["misses"] == 1
+    assert reopened.get_stats()["hits"] == 1
+    assert not list((tmp_path / "responses").glob("*.tmp"))
+
+
+def test_key_parts_are_length_prefixed():
+    """Test moving text between parts changes the key."""
+    assert AnalysisCache.make_key("ab", "c") != AnalysisCache.make_key("a", "bc")
+    assert AnalysisCache.make_key("ab", "c") == AnalysisCache.make_key("ab", "c")
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    """Test an unreadable entry counts as a miss and is removed."""
+    cache = AnalysisCache(tmp_path)
+    key = AnalysisCache.make_key("model", "prompt")
+    (tmp_path / f"{key}.json").write_text("{not json")
+
+    assert cache.get(key) is None
+    assert not (tmp_path / f"{key}.json").exists()
+
+
+def test_oldest_entries_pruned_past_cap(tmp_path):
+    """Test the cache keeps at most max_entries, dropping the oldest."""
+    cache = AnalysisCache(tmp_path, max_entries=10)
+    keys = [AnalysisCache.make_key(str(i)) for i in range(11)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"i": i})
+        os.utime(tmp_path / f"{key}.json", (i, i))
+
+    assert len(list(tmp_path.glob("*.json"))) == 9
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[-1]) == {"i": 10}
@@ -1,4 +1,6 @@
 """Tests for the metadata agent."""
+import ast
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -179,3 +181,67 @@ class DataProcessor:
     assert metadata.imports == ["typing.Dict", "typing.List", "typing.Optional", "typing.Any"]
     assert "process" in metadata.docstrings
     assert metadata.types is not None
+
+@pytest.mark.asyncio
+async def test_reasoning_agent_uses_single_pass_extractor(code_context, monkeypatch):
+    """Test the reasoning metadata agent delegates to the AST extractor."""
+    from src.reasoning.agents.metadata_agent import (
+        MetadataGenerationAgent as ReasoningMetadataAgent
+    )
+    from src.reasoning.types import CodeMetadata as ReasoningCodeMetadata
+    
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    agent = ReasoningMetadataAgent()
+    metadata = await agent.extract_metadata(code_context)
+    
+    assert isinstance(metadata, ReasoningCodeMetadata)
+    assert metadata.success
+    assert [f["name"] for f in metadata.functions] == ["process_data"]
+    assert metadata.docstrings == {"process_data": "Process input data"}
+    assert metadata.dependency_depth == 2
+    assert metadata == ReasoningCodeMetadata.model_validate(metadata.model_dump())
+
+@pytest.mark.asyncio
+async def test_reasoning_agent_skips_retrieval_for_self_contained_code(monkeypatch):
+    """Test retrieval only runs for snippets that reference other code."""
+    from src.reasoning.agents.metadata_agent import (
+        MetadataGenerationAgent as ReasoningMetadataAgent
+    )
+    
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    retriever = MagicMock()
+    retriever.get_context = AsyncMock(return_value={"imports": ["import requests"]})
+    agent = ReasoningMetadataAgent(gemini_retriever=retriever)
+    
+    def make_context(code):
+        return CodeContext(
+            code_snippet=code,
+            file_path="module.py",
+            start_line=1,
+            end_line=code.count("\n") + 1,
+            language="python",
+            understanding_level=CodeUnderstandingLevel.SURFACE
+        )
+    
+    body = "".join(f"\n\ndef step_{i}(path):\n    return os.path.join(path, 'x')" for i in range(5))
+    parse = MagicMock(side_effect=ast.parse)
+    monkeypatch.setattr(ast, "parse", parse)
+    stdlib_only = await agent.analyze(make_context("import os" + body))
+    assert retriever.get_context.await_count == 0
+    assert stdlib_only.findings["imports"] == ["import os"]
+    assert parse.call_count == 1
+    
+    third_party = await agent.analyze(make_context("import os\nimport requests" + body))
+    assert retriever.get_context.await_count == 1
+    assert third_party.findings["imports"] == ["import requests"]
+    # Fields retrieval didn't return come from the local extraction
+    assert len(third_party.findings["functions"]) == 5
+    assert parse.call_count == 2
+    
+    await agent.analyze(make_context("import os\nfrom .types import Config" + body))
+    assert retriever.get_context.await_count == 2
+    
+    await agent.analyze(make_context(
+        body + "\n\ndef run(path):\n    return load_settings(step_0(path))"
+    ))
+    assert retriever.get_context.await_count == 3
@@ -1,7 +1,19 @@
 """Unit tests for metadata extraction and processing."""
 
+import os
+import signal
+
 import pytest
-from src.metadata.metadata_manager import process_code_chunk, CodeChunk
+from unittest.mock import patch
+
+from src.metadata import metadata_manager
+from src.metadata.metadata_manager import (
+    MetadataGenerationAgent,
+    clear_chunk_cache,
+    process_code_chunk,
+    process_code_chunks,
+    CodeChunk
+)
 from src.metadata.types import CodeMetadata, MetadataRequest, MetadataExtractionLevel
 
 @pytest.fixture
@@ -133,3 +145,100 @@ async def test_code_chunk_dataclass():
     assert chunk.start_line == 1
     assert chunk.end_line == 1
     assert chunk.file_path == "test.py"
+    assert not hasattr(chunk, "__dict__")
+
+@pytest.mark.asyncio
+async def test_process_code_chunks_matches_single(sample_code):
+    """Test batch processing matches per-chunk processing, in order."""
+    chunks = [
+        CodeChunk(code=sample_code),
+        CodeChunk(code="def helper(x: int) -> int:\n    return x"),
+        CodeChunk(code="def broken(:\n")
+    ]
+
+    results = await process_code_chunks(chunks, max_workers=2)
+
+    assert len(results) == 3
+    for chunk, metadata in zip(chunks, results):
+        assert metadata == await process_code_chunk(chunk.code)
+        assert chunk.metadata == metadata
+    assert not results[2].success
+
+@pytest.mark.asyncio
+async def test_process_code_chunks_recovers_from_dead_worker(sample_code):
+    """Test a worker pool broken by a killed worker is replaced."""
+    pool = metadata_manager._get_process_pool(1)
+    pool.submit(os.getpid).result()
+    os.kill(next(iter(pool._processes)), signal.SIGKILL)
+    clear_chunk_cache()
+
+    try:
+        results = await process_code_chunks(
+            [CodeChunk(code=sample_code), CodeChunk(code="x: int = 1")],
+            max_workers=1
+        )
+        assert metadata_manager._process_pools[1] is not pool
+    finally:
+        metadata_manager.shutdown_process_pools()
+
+    assert results[0] == await process_code_chunk(sample_code)
+    assert results[1].types == {"x": "int"}
+
+@pytest.mark.asyncio
+async def test_process_code_chunks_uses_chunk_cache(sample_code):
+    """Test cached and duplicate chunks aren't sent to the worker pool."""
+    clear_chunk_cache()
+    helper = "def helper(x: int) -> int:\n    return x"
+    await process_code_chunk(sample_code)
+
+    with patch("src.metadata.metadata_manager._get_process_pool") as get_pool:
+        results = await process_code_chunks([
+            CodeChunk(code=sample_code),
+            CodeChunk(code=helper),
+            CodeChunk(code=helper)
+        ])
+        get_pool.assert_not_called()
+
+    assert results[0] == await process_code_chunk(sample_code)
+    assert results[1] == results[2] == await process_code_chunk(helper)
+    assert results[1] is not results[2]
+
+@pytest.mark.asyncio
+async def test_process_code_chunk_cached(sample_code):
+    """Test identical code is extracted once and cached results stay isolated."""
+    clear_chunk_cache()
+    extract = MetadataGenerationAgent.extract_metadata
+    with patch.object(
+        MetadataGenerationAgent, "extract_metadata", autospec=True, side_effect=extract
+    ) as spy:
+        first = await process_code_chunk(sample_code)
+        first.classes.clear()
+        second = await process_code_chunk(sample_code)
+        assert spy.call_count == 1
+        assert len(second.classes) == 2
+
+        await process_code_chunk(sample_code, language="cython")
+        assert spy.call_count == 2
+
+        clear_chunk_cache()
+        await process_code_chunk(sample_code)
+        assert spy.call_count == 3
+
+@pytest.mark.asyncio
+async def test_process_code_chunk_dotted_bases_and_decorators():
+    """Test dotted base classes and called decorators are reported."""
+    code = """
+import abc
+import dataclasses
+
+@dataclasses.dataclass(frozen=True)
+@total_ordering
+class Record(abc.ABC, Mixin, make_base().Inner):
+    pass
+"""
+
+    metadata = await process_code_chunk(code)
+
+    record = metadata.classes[0]
+    assert record["base_classes"] == ["abc.ABC", "Mixin"]
+    assert record["decorators"] == ["dataclasses.dataclass", "total_ordering"]